@@ -4,14 +4,72 @@
 import sqlite3
 import sys
 import os
+import time
+import threading
+import functools
 from typing import Dict, List, Optional, Tuple
 from datetime import datetime, timedelta
-from dataclasses import dataclass
+from dataclasses import dataclass, asdict
+from collections import defaultdict, OrderedDict
 import json
 
 sys.path.insert(0, os.path.dirname(__file__))
 from database_schema import ClaudeDatabase
 
+# Buckets a subprocess command into Python/Node.js/System Tools/Docker/Other,
+# evaluated inside SQLite so command text never has to reach Python
+SUBPROCESS_CATEGORY_SQL = '''
+    CASE
+        WHEN instr(lower(pt.command), 'python') > 0 THEN 'Python'
+        WHEN instr(lower(pt.command), 'node') > 0
+          OR instr(lower(pt.command), 'npm') > 0 THEN 'Node.js'
+        WHEN instr(lower(pt.command), 'git') > 0
+          OR instr(lower(pt.command), 'ssh') > 0
+          OR instr(lower(pt.command), 'curl') > 0
+          OR instr(lower(pt.command), 'wget') > 0 THEN 'System Tools'
+        WHEN instr(lower(pt.command), 'docker') > 0 THEN 'Docker'
+        ELSE 'Other'
+    END
+'''
+
+# Report cache generation per database file, bumped by invalidate_report_cache()
+_cache_generations: Dict[str, int] = defaultdict(int)
+
+def invalidate_report_cache(db_path: str):
+    """Drop cached analytics results for a database after its data changed"""
+    _cache_generations[os.path.abspath(db_path)] += 1
+
+def ttl_cache(seconds: float = 30.0, maxsize: int = 100):
+    """Memoize a ClaudeAnalytics method per instance for a short time
+    
+    Entries are keyed on the call arguments and the database's cache
+    generation, and evicted least-recently-used beyond maxsize. Cached
+    results are shared between callers and must be treated as read-only.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(self, *args, **kwargs):
+            key = (func.__name__, args, tuple(sorted(kwargs.items())),
+                   _cache_generations[self._cache_path])
+            now = time.monotonic()
+            
+            with self._cache_lock:
+                entry = self._report_cache.get(key)
+                if entry is not None and now - entry[0] < seconds:
+                    self._report_cache.move_to_end(key)
+                    return entry[1]
+            
+            result = func(self, *args, **kwargs)
+            
+            with self._cache_lock:
+                self._report_cache[key] = (now, result)
+                self._report_cache.move_to_end(key)
+                while len(self._report_cache) > maxsize:
+                    self._report_cache.popitem(last=False)
+            return result
+        return wrapper
+    return decorator
+
 @dataclass
 class UsageReport:
     project_name: str
@@ -45,64 +103,68 @@ class ClaudeAnalytics:
     def __init__(self, db_path: str = "claude_tracking.db"):
         self.db_path = db_path
         self.db = ClaudeDatabase(db_path)
+        # One long-lived read-only connection keeps SQLite's page and statement
+        # caches warm across report calls; writes stay with the monitor's
+        # connections, and with the file in WAL mode neither blocks the other
+        self._conn = self.db.connect(check_same_thread=False, read_only=True)
+        
+        # Short-lived memo of heavy aggregations (see ttl_cache)
+        self._cache_path = os.path.abspath(db_path)
+        self._cache_lock = threading.Lock()
+        self._report_cache: OrderedDict = OrderedDict()
     
+    def close(self):
+        """Close the analytics connection"""
+        self._conn.close()
+    
+    @ttl_cache(seconds=30)
     def generate_usage_report(self, days: int = 7) -> List[UsageReport]:
         """Generate comprehensive usage report for the last N days"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        cursor = self._conn.cursor()
         
         # Get project usage statistics
         cursor.execute('''
             SELECT 
                 p.name,
                 COUNT(DISTINCT ps.id) as session_count,
-                SUM(COALESCE(ps.duration_seconds, 0)) / 3600.0 as total_runtime_hours,
+                SUM(ps.elapsed_seconds) / 3600.0 as total_runtime_hours,
                 AVG(pm.cpu_percent) as avg_cpu,
                 AVG(pm.memory_mb) as avg_memory,
                 MAX(pm.memory_mb) as peak_memory,
                 MAX(pm.net_bytes_total) as total_network,
                 MAX(pm.disk_total_bytes) as total_disk,
                 MIN(ps.start_time) as first_seen,
-                MAX(COALESCE(ps.end_time, ps.start_time)) as last_seen
+                MAX(COALESCE(ps.end_time, ps.start_time)) as last_seen,
+                p.id
             FROM projects p
             LEFT JOIN process_sessions ps ON p.id = ps.project_id
             LEFT JOIN process_metrics pm ON ps.id = pm.session_id
-            WHERE ps.start_time >= datetime('now', '-{} days')
+            WHERE ps.start_time >= datetime('now', ?)
             GROUP BY p.id, p.name
             HAVING session_count > 0
             ORDER BY total_runtime_hours DESC
-        '''.format(days))
+        ''', (f'-{days} days',))
         
         results = cursor.fetchall()
-        reports = []
         
+        # Get subprocess types for all projects in one pass
+        cursor.execute(f'''
+            SELECT p.id, {SUBPROCESS_CATEGORY_SQL} as category, COUNT(*) as count
+            FROM process_tree pt
+            JOIN process_sessions ps ON pt.session_id = ps.id
+            JOIN projects p ON ps.project_id = p.id
+            WHERE pt.timestamp >= datetime('now', ?)
+            GROUP BY p.id, category
+            ORDER BY p.id, count DESC
+        ''', (f'-{days} days',))
+        
+        subprocess_types_by_project = defaultdict(dict)
+        for project_id, category, count in cursor.fetchall():
+            subprocess_types_by_project[project_id][category] = count
+        
+        reports = []
         for row in results:
-            # Get subprocess types for this project
-            cursor.execute('''
-                SELECT pt.command, COUNT(*) as count
-                FROM process_tree pt
-                JOIN process_sessions ps ON pt.session_id = ps.id
-                JOIN projects p ON ps.project_id = p.id
-                WHERE p.name = ? AND pt.timestamp >= datetime('now', '-{} days')
-                GROUP BY pt.command
-                ORDER BY count DESC
-            '''.format(days), (row[0],))
-            
-            subprocess_data = cursor.fetchall()
-            subprocess_types = {}
-            for cmd, count in subprocess_data:
-                # Categorize subprocess types
-                cmd_lower = cmd.lower()
-                if 'python' in cmd_lower:
-                    subprocess_types['Python'] = subprocess_types.get('Python', 0) + count
-                elif 'node' in cmd_lower or 'npm' in cmd_lower:
-                    subprocess_types['Node.js'] = subprocess_types.get('Node.js', 0) + count
-                elif any(term in cmd_lower for term in ['git', 'ssh', 'curl', 'wget']):
-                    subprocess_types['System Tools'] = subprocess_types.get('System Tools', 0) + count
-                elif 'docker' in cmd_lower:
-                    subprocess_types['Docker'] = subprocess_types.get('Docker', 0) + count
-                else:
-                    subprocess_types['Other'] = subprocess_types.get('Other', 0) + count
+            subprocess_types = subprocess_types_by_project.get(row[10], {})
             
             reports.append(UsageReport(
                 project_name=row[0],
@@ -118,13 +180,12 @@ class ClaudeAnalytics:
                 subprocess_types=subprocess_types
             ))
         
-        conn.close()
+        cursor.close()
         return reports
     
     def get_session_details(self, session_id: Optional[int] = None, limit: int = 10) -> List[SessionSummary]:
         """Get detailed session information"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        cursor = self._conn.cursor()
         
         if session_id:
             where_clause = "WHERE ps.id = ?"
@@ -136,7 +197,7 @@ class ClaudeAnalytics:
         if session_id:
             cursor.execute('''
                 SELECT 
-                    ps.id, ps.pid, p.name, ps.start_time, ps.end_time, ps.duration_seconds,
+                    ps.id, ps.pid, p.name, ps.start_time, ps.end_time, ps.elapsed_seconds,
                     AVG(pm.cpu_percent) as avg_cpu,
                     AVG(pm.memory_mb) as avg_memory,
                     MAX(pm.memory_mb) as max_memory,
@@ -146,12 +207,12 @@ class ClaudeAnalytics:
                 JOIN projects p ON ps.project_id = p.id
                 LEFT JOIN process_metrics pm ON ps.id = pm.session_id
                 WHERE ps.id = ?
-                GROUP BY ps.id, ps.pid, p.name, ps.start_time, ps.end_time, ps.duration_seconds
+                GROUP BY ps.id, ps.pid, p.name, ps.start_time, ps.end_time, ps.elapsed_seconds
             ''', params)
         else:
             cursor.execute('''
                 SELECT 
-                    ps.id, ps.pid, p.name, ps.start_time, ps.end_time, ps.duration_seconds,
+                    ps.id, ps.pid, p.name, ps.start_time, ps.end_time, ps.elapsed_seconds,
                     AVG(pm.cpu_percent) as avg_cpu,
                     AVG(pm.memory_mb) as avg_memory,
                     MAX(pm.memory_mb) as max_memory,
@@ -160,26 +221,32 @@ class ClaudeAnalytics:
                 FROM process_sessions ps
                 JOIN projects p ON ps.project_id = p.id
                 LEFT JOIN process_metrics pm ON ps.id = pm.session_id
-                GROUP BY ps.id, ps.pid, p.name, ps.start_time, ps.end_time, ps.duration_seconds
+                GROUP BY ps.id, ps.pid, p.name, ps.start_time, ps.end_time, ps.elapsed_seconds
                 ORDER BY ps.start_time DESC 
                 LIMIT ?
             ''', params)
         
         results = cursor.fetchall()
-        summaries = []
         
-        for row in results:
-            # Get status changes for this session
-            cursor.execute('''
-                SELECT DISTINCT status, COUNT(*) as count
+        # Get status changes for all sessions in one pass
+        status_by_session: Dict[int, List[str]] = defaultdict(list)
+        if results:
+            session_ids = [row[0] for row in results]
+            placeholders = ','.join('?' * len(session_ids))
+            cursor.execute(f'''
+                SELECT session_id, status, COUNT(*) as count
                 FROM process_metrics 
-                WHERE session_id = ?
-                GROUP BY status
-                ORDER BY count DESC
-            ''', (row[0],))
+                WHERE session_id IN ({placeholders})
+                GROUP BY session_id, status
+                ORDER BY session_id, count DESC
+            ''', session_ids)
             
-            status_data = cursor.fetchall()
-            status_changes = [f"{status}({count})" for status, count in status_data]
+            for sid, status, count in cursor.fetchall():
+                status_by_session[sid].append(f"{status}({count})")
+        
+        summaries = []
+        for row in results:
+            status_changes = status_by_session.get(row[0], [])
             
             duration_minutes = row[5] / 60.0 if row[5] else None
             
@@ -198,60 +265,59 @@ class ClaudeAnalytics:
                 status_changes=status_changes
             ))
         
-        conn.close()
+        cursor.close()
         return summaries
     
+    @ttl_cache(seconds=30)
     def get_resource_trends(self, project_name: str, hours: int = 24) -> Dict[str, List]:
         """Get resource usage trends for a project over time"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        cursor = self._conn.cursor()
         
         cursor.execute('''
             SELECT 
-                datetime(pm.timestamp) as timestamp,
-                AVG(pm.cpu_percent) as avg_cpu,
-                AVG(pm.memory_mb) as avg_memory,
-                SUM(pm.disk_current_bytes) as disk_activity,
+                datetime(CAST(strftime('%s', pm.timestamp) / 300 AS INTEGER) * 300, 'unixepoch') as bucket,
+                COALESCE(AVG(pm.cpu_percent), 0) as avg_cpu,
+                COALESCE(AVG(pm.memory_mb), 0) as avg_memory,
+                COALESCE(SUM(pm.disk_current_bytes), 0) as disk_activity,
                 COUNT(DISTINCT ps.pid) as active_processes
             FROM process_metrics pm
             JOIN process_sessions ps ON pm.session_id = ps.id
             JOIN projects p ON ps.project_id = p.id
-            WHERE p.name = ? AND pm.timestamp >= datetime('now', '-{} hours')
-            GROUP BY datetime(pm.timestamp, '+5 minutes') -- 5-minute intervals
-            ORDER BY timestamp
-        '''.format(hours), (project_name,))
+            WHERE p.name = ? AND pm.timestamp >= datetime('now', ?)
+            GROUP BY CAST(strftime('%s', pm.timestamp) / 300 AS INTEGER) -- 5-minute intervals
+            ORDER BY bucket
+        ''', (project_name, f'-{hours} hours'))
         
         results = cursor.fetchall()
         
+        # Transpose rows into columns in one pass; NULLs are already zeroed in SQL
+        columns = zip(*results) if results else ((),) * 5
         trends = {
-            'timestamps': [],
-            'cpu_percent': [],
-            'memory_mb': [],
-            'disk_activity': [],
-            'process_count': []
+            key: list(column)
+            for key, column in zip(
+                ('timestamps', 'cpu_percent', 'memory_mb', 'disk_activity', 'process_count'),
+                columns
+            )
         }
         
-        for row in results:
-            trends['timestamps'].append(row[0])
-            trends['cpu_percent'].append(row[1] or 0)
-            trends['memory_mb'].append(row[2] or 0)
-            trends['disk_activity'].append(row[3] or 0)
-            trends['process_count'].append(row[4] or 0)
-        
-        conn.close()
+        cursor.close()
         return trends
     
-    def get_subprocess_analysis(self, project_name: Optional[str] = None) -> Dict[str, any]:
-        """Analyze subprocess patterns"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+    @ttl_cache(seconds=30)
+    def get_subprocess_analysis(self, project_name: Optional[str] = None,
+                                days: Optional[int] = None) -> Dict[str, any]:
+        """Analyze subprocess patterns, over the last N days when days is given"""
+        cursor = self._conn.cursor()
         
+        conditions = []
+        params = ()
+        if days is not None:
+            conditions.append("pt.timestamp >= datetime('now', ?)")
+            params += (f'-{days} days',)
         if project_name:
-            where_clause = "WHERE p.name = ?"
-            params = (project_name,)
-        else:
-            where_clause = ""
-            params = ()
+            conditions.append("p.name = ?")
+            params += (project_name,)
+        where_clause = f"WHERE {' AND '.join(conditions)}" if conditions else ""
         
         cursor.execute(f'''
             SELECT 
@@ -259,7 +325,8 @@ class ClaudeAnalytics:
                 COUNT(*) as frequency,
                 AVG(pt.cpu_percent) as avg_cpu,
                 AVG(pt.memory_mb) as avg_memory,
-                MAX(pt.depth) as max_depth
+                MAX(pt.depth) as max_depth,
+                {SUBPROCESS_CATEGORY_SQL} as category
             FROM process_tree pt
             JOIN process_sessions ps ON pt.session_id = ps.id
             JOIN projects p ON ps.project_id = p.id
@@ -279,8 +346,9 @@ class ClaudeAnalytics:
             'categories': {'Python': 0, 'Node.js': 0, 'System Tools': 0, 'Docker': 0, 'Other': 0}
         }
         
-        for cmd, freq, avg_cpu, avg_mem, max_depth in results:
+        for cmd, freq, avg_cpu, avg_mem, max_depth, category in results:
             analysis['command_frequency'][cmd] = freq
+            analysis['categories'][category] += freq
             
             # Identify resource-heavy subprocesses
             if avg_cpu > 5.0 or avg_mem > 50.0:
@@ -290,74 +358,82 @@ class ClaudeAnalytics:
                     'avg_cpu': avg_cpu,
                     'avg_memory': avg_mem
                 })
-            
-            # Categorize
-            cmd_lower = cmd.lower()
-            if 'python' in cmd_lower:
-                analysis['categories']['Python'] += freq
-            elif 'node' in cmd_lower or 'npm' in cmd_lower:
-                analysis['categories']['Node.js'] += freq
-            elif any(term in cmd_lower for term in ['git', 'ssh', 'curl', 'wget']):
-                analysis['categories']['System Tools'] += freq
-            elif 'docker' in cmd_lower:
-                analysis['categories']['Docker'] += freq
-            else:
-                analysis['categories']['Other'] += freq
         
-        conn.close()
+        cursor.close()
         return analysis
     
+    @staticmethod
+    def _write_report_list(f, name: str, records):
+        """Write one list of the report a record at a time, laid out like json.dump(..., indent=2)"""
+        f.write(f',\n  {json.dumps(name)}: [')
+        empty = True
+        for record in records:
+            f.write('\n    ' if empty else ',\n    ')
+            f.write(json.dumps(asdict(record), indent=2, default=str).replace('\n', '\n    '))
+            empty = False
+        f.write(']' if empty else '\n  ]')
+    
     def export_report(self, output_file: str, format: str = 'json'):
-        """Export comprehensive report to file"""
-        report_data = {
-            'generated_at': datetime.now().isoformat(),
-            'usage_report_7d': [report.__dict__ for report in self.generate_usage_report(7)],
-            'recent_sessions': [session.__dict__ for session in self.get_session_details(limit=20)],
-            'subprocess_analysis': self.get_subprocess_analysis()
-        }
+        """Export comprehensive report to file
         
-        if format.lower() == 'json':
-            with open(output_file, 'w') as f:
-                json.dump(report_data, f, indent=2, default=str)
-        else:
+        Each section is written as soon as it is fetched, a record at a time,
+        rather than collected into a single document first.
+        """
+        if format.lower() != 'json':
             raise ValueError(f"Unsupported format: {format}")
         
+        with open(output_file, 'w') as f:
+            f.write(f'{{\n  "generated_at": {json.dumps(datetime.now().isoformat())}')
+            self._write_report_list(f, 'usage_report_7d', self.generate_usage_report(7))
+            self._write_report_list(f, 'recent_sessions', self.get_session_details(limit=20))
+            
+            f.write(',\n  "subprocess_analysis": ')
+            subprocess_analysis = json.dumps(self.get_subprocess_analysis(), indent=2, default=str)
+            f.write(subprocess_analysis.replace('\n', '\n  '))
+            f.write('\n}')
+        
         return output_file
     
     def print_usage_summary(self, days: int = 7):
         """Print a formatted usage summary"""
         reports = self.generate_usage_report(days)
         
-        print(f"Claude Usage Report - Last {days} Days")
-        print("=" * 60)
-        
         total_sessions = sum(r.session_count for r in reports)
         total_runtime = sum(r.total_runtime_hours for r in reports)
         
-        print(f"Total Projects: {len(reports)}")
-        print(f"Total Sessions: {total_sessions}")
-        print(f"Total Runtime: {total_runtime:.1f} hours")
-        print()
-        
-        print("Project Breakdown:")
-        print("-" * 60)
-        print(f"{'Project':<20} {'Sessions':<8} {'Runtime':<10} {'Avg CPU':<8} {'Avg Mem':<10}")
-        print("-" * 60)
+        lines = [
+            f"Claude Usage Report - Last {days} Days",
+            "=" * 60,
+            f"Total Projects: {len(reports)}",
+            f"Total Sessions: {total_sessions}",
+            f"Total Runtime: {total_runtime:.1f} hours",
+            "",
+            "Project Breakdown:",
+            "-" * 60,
+            f"{'Project':<20} {'Sessions':<8} {'Runtime':<10} {'Avg CPU':<8} {'Avg Mem':<10}",
+            "-" * 60,
+        ]
         
-        for report in reports:
-            print(f"{report.project_name:<20} {report.session_count:<8} "
-                  f"{report.total_runtime_hours:<10.1f} {report.avg_cpu_percent:<8.1f} "
-                  f"{report.avg_memory_mb:<10.1f}")
-        
-        print()
+        lines.extend(
+            f"{report.project_name:<20} {report.session_count:<8} "
+            f"{report.total_runtime_hours:<10.1f} {report.avg_cpu_percent:<8.1f} "
+            f"{report.avg_memory_mb:<10.1f}"
+            for report in reports
+        )
+        lines.append("")
         
         # Subprocess analysis
-        subprocess_analysis = self.get_subprocess_analysis()
-        print("Subprocess Analysis:")
-        print("-" * 40)
-        for category, count in subprocess_analysis['categories'].items():
-            if count > 0:
-                print(f"  {category}: {count} instances")
+        subprocess_analysis = self.get_subprocess_analysis(days=days)
+        lines.append("Subprocess Analysis:")
+        lines.append("-" * 40)
+        lines.extend(
+            f"  {category}: {count} instances"
+            for category, count in subprocess_analysis['categories'].items()
+            if count > 0
+        )
+        
+        # One write instead of a print() per row
+        sys.stdout.write("\n".join(lines) + "\n")
 
 def test_analytics():
     """Test analytics functions"""
@@ -6,11 +6,14 @@ import os
 sys.path.insert(0, os.path.dirname(__file__))
 
 from claude_top_core import ClaudeMonitor, ClaudeInstance
-from database_schema import ClaudeDatabase, ProcessTreeNode
+from database_schema import ClaudeDatabase, ProcessTreeNode, instance_metrics_rows
 from process_tree import ProcessTreeTracker, ProcessNode
+from analytics import invalidate_report_cache
+import threading
 import time
-from typing import Dict, List, Optional
-from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+from collections import defaultdict, deque
+from operator import attrgetter
 
 class ClaudeMonitorDB(ClaudeMonitor):
     def __init__(self, db_path: str = "claude_tracking.db"):
@@ -19,12 +22,25 @@ class ClaudeMonitorDB(ClaudeMonitor):
         self.tree_tracker = ProcessTreeTracker()
         self.active_sessions: Dict[int, int] = {}  # pid -> session_id
         self.project_cache: Dict[str, int] = {}  # working_dir -> project_id
+        # pid -> (max_depth, tree) discovered during the current cycle. Scans
+        # and subprocess analysis may run on different threads, and deepening a
+        # cached tree mutates it in place, so the cache and every walk over a
+        # cached tree are done under _tree_lock
+        self._tree_cache: Dict[int, Tuple[int, ProcessNode]] = {}
+        self._tree_lock = threading.RLock()
+        self._recorded_instances = None
         self.enable_tree_tracking = True
         self.enable_database_logging = True
     
     def find_claude_processes(self):
         """Enhanced process discovery with database tracking"""
         instances = super().find_claude_processes()
+        # Inside the minimum poll interval the previous, already recorded scan comes back
+        if instances is self._recorded_instances:
+            return instances
+        self._recorded_instances = instances
+        with self._tree_lock:
+            self._tree_cache.clear()
         
         if not self.enable_database_logging:
             return instances
@@ -33,12 +49,14 @@ class ClaudeMonitorDB(ClaudeMonitor):
         
         # End sessions for processes that are no longer running
         ended_pids = set(self.active_sessions.keys()) - current_pids
+        sessions_changed = bool(ended_pids)
         for pid in ended_pids:
             session_id = self.active_sessions[pid]
             self.db.end_session(session_id)
             del self.active_sessions[pid]
         
-        # Start sessions for new processes and record metrics for all
+        # Start sessions for new processes and collect process trees
+        tree_batches = []
         for instance in instances:
             if instance.pid not in self.active_sessions:
                 # Start new session
@@ -49,69 +67,102 @@ class ClaudeMonitorDB(ClaudeMonitor):
                     instance.command
                 )
                 self.active_sessions[instance.pid] = session_id
+                sessions_changed = True
             
-            # Record current metrics
-            session_id = self.active_sessions[instance.pid]
-            metrics = {
-                'cpu_percent': instance.cpu_percent,
-                'memory_mb': instance.memory_mb,
-                'net_bytes_sent': instance.net_bytes_sent,
-                'net_bytes_recv': instance.net_bytes_recv,
-                'net_bytes_total': instance.net_bytes_total,
-                'disk_total_bytes': instance.disk_total_bytes,
-                'disk_current_bytes': instance.disk_current_bytes,
-                'connections_count': instance.connections_count,
-                'mcp_connections': instance.mcp_connections,
-                'status': instance.status
-            }
-            self.db.record_metrics(session_id, metrics)
-            
-            # Record process tree if enabled
+            # Process tree if enabled
             if self.enable_tree_tracking:
-                self.record_process_tree(instance.pid, session_id)
+                tree_nodes = self.collect_process_tree(instance.pid)
+                if tree_nodes:
+                    tree_batches.append((self.active_sessions[instance.pid], tree_nodes))
+        
+        # Write the whole cycle in one transaction instead of one per row
+        if instances:
+            with self.db.transaction() as conn:
+                self.db.record_metrics_many(
+                    instance_metrics_rows(instances, self.active_sessions), conn
+                )
+                for session_id, tree_nodes in tree_batches:
+                    self.db.record_process_tree(session_id, tree_nodes, conn)
+        
+        # Per-cycle metric samples are covered by the report cache TTL;
+        # sessions starting or ending invalidate cached reports right away
+        if sessions_changed:
+            invalidate_report_cache(self.db.db_path)
         
         return instances
     
     def get_or_create_project(self, working_dir: str) -> int:
         """Get or create project with caching"""
-        if working_dir in self.project_cache:
-            return self.project_cache[working_dir]
+        project_id = self.project_cache.get(working_dir)
+        if project_id is not None:
+            return project_id
         
         project_id = self.db.get_or_create_project(working_dir)
         self.project_cache[working_dir] = project_id
         return project_id
     
-    def record_process_tree(self, root_pid: int, session_id: int):
-        """Record the process tree for a Claude instance"""
+    def collect_process_tree(self, root_pid: int) -> Optional[List[ProcessTreeNode]]:
+        """Discover the process tree for a Claude instance as database nodes"""
         try:
-            tree = self.tree_tracker.discover_process_tree(root_pid, max_depth=2)
-            if tree:
-                # Convert ProcessNode to ProcessTreeNode for database
-                tree_nodes = self.convert_tree_to_db_nodes(tree)
-                self.db.record_process_tree(session_id, tree_nodes)
+            with self._tree_lock:
+                tree = self.get_process_tree(root_pid, max_depth=2)
+                if tree:
+                    # Convert ProcessNode to ProcessTreeNode for database
+                    return self.convert_tree_to_db_nodes(tree)
         except Exception as e:
             # Don't let tree tracking failures break monitoring
             pass
+        return None
+    
+    def get_process_tree(self, root_pid: int, max_depth: int = 3) -> Optional[ProcessNode]:
+        """Get the process tree for a PID, reusing this cycle's discovery
+        
+        A cached tree that is shallower than requested is deepened in place
+        rather than rediscovered from the root.
+        """
+        with self._tree_lock:
+            cached = self._tree_cache.get(root_pid)
+            if cached:
+                cached_depth, tree = cached
+                if cached_depth < max_depth:
+                    self.tree_tracker.extend_tree(tree, cached_depth, max_depth)
+                    self._tree_cache[root_pid] = (max_depth, tree)
+                return tree
+            
+            tree = self.tree_tracker.discover_process_tree(root_pid, max_depth=max_depth)
+            if tree:
+                self._tree_cache[root_pid] = (max_depth, tree)
+            return tree
+    
+    def record_process_tree(self, root_pid: int, session_id: int):
+        """Record the process tree for a Claude instance"""
+        tree_nodes = self.collect_process_tree(root_pid)
+        if tree_nodes:
+            try:
+                self.db.record_process_tree(session_id, tree_nodes)
+            except Exception as e:
+                # Don't let tree tracking failures break monitoring
+                pass
     
     def convert_tree_to_db_nodes(self, node: ProcessNode) -> List[ProcessTreeNode]:
         """Convert ProcessNode tree to flat list of ProcessTreeNode for database"""
         nodes = []
+        stack = deque([node])
         
-        def flatten_tree(process_node: ProcessNode):
-            db_node = ProcessTreeNode(
+        # Iterative pre-order walk: children are pushed in reverse so they
+        # come out in their original order
+        while stack:
+            process_node = stack.pop()
+            nodes.append(ProcessTreeNode(
                 pid=process_node.pid,
                 parent_pid=process_node.parent_pid,
                 command=process_node.command,
                 cpu_percent=process_node.cpu_percent,
                 memory_mb=process_node.memory_mb,
                 children=[]  # Will be flattened
-            )
-            nodes.append(db_node)
-            
-            for child in process_node.children:
-                flatten_tree(child)
+            ))
+            stack.extend(reversed(process_node.children))
         
-        flatten_tree(node)
         return nodes
     
     def get_project_summary(self) -> Dict[str, any]:
@@ -139,7 +190,7 @@ class ClaudeMonitorDB(ClaudeMonitor):
         # Sort projects by activity
         summary['top_projects'] = sorted(
             stats, 
-            key=lambda x: (x.total_sessions, x.total_runtime), 
+            key=attrgetter('total_sessions', 'total_runtime'), 
             reverse=True
         )[:5]
         
@@ -149,11 +200,12 @@ class ClaudeMonitorDB(ClaudeMonitor):
         """Get subprocess analysis for all active Claude processes"""
         analysis = {}
         
-        for pid in self.active_sessions.keys():
+        for pid in list(self.active_sessions):
             try:
-                tree = self.tree_tracker.discover_process_tree(pid)
-                if tree:
-                    analysis[pid] = self.tree_tracker.analyze_subprocess_activity(tree)
+                with self._tree_lock:
+                    tree = self.get_process_tree(pid)
+                    if tree:
+                        analysis[pid] = self.tree_tracker.analyze_subprocess_activity(tree)
             except:
                 continue
         
@@ -167,7 +219,10 @@ class ClaudeMonitorDB(ClaudeMonitor):
         """Gracefully shutdown and end all active sessions"""
         for pid, session_id in self.active_sessions.items():
             self.db.end_session(session_id)
+        if self.active_sessions:
+            invalidate_report_cache(self.db.db_path)
         self.active_sessions.clear()
+        self.db.close()
 
 def test_enhanced_monitoring():
     """Test the enhanced monitoring with database tracking"""
@@ -4,12 +4,31 @@
 import psutil
 import signal
 import os
-from dataclasses import dataclass, field
+import re
+import sys
+import time
 from datetime import datetime
 from collections import deque
-from typing import List, Optional
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from operator import attrgetter
+from typing import List, Optional, Tuple
 
-@dataclass
+from compat import dataclass_slots
+
+# Command-line filters for is_claude_cli, each matched in a single regex scan.
+# Verdicts are cached per process, so these run once per process lifetime;
+# the per-refresh pre-filter (cmdline_mentions_claude) is a plain bytes search
+_CLAUDE_RE = re.compile(r'claude', re.IGNORECASE)
+# Claude desktop app processes, claude-top itself, and the filesystem MCP
+# server's docker container (both words present, in either order)
+_EXCLUDE_RE = re.compile(
+    r'Claude\.app|Claude Helper|chrome_crashpad|Squirrel|claude-top'
+    r'|docker.*mcp/filesystem|mcp/filesystem.*docker',
+    re.DOTALL,
+)
+
+@dataclass_slots
 class ClaudeInstance:
     pid: int
     working_dir: str
@@ -21,15 +40,97 @@ class ClaudeInstance:
     cpu_percent: float
     memory_mb: float
     command: str
-    cpu_history: deque = field(default_factory=lambda: deque(maxlen=5))
+    cpu_history: Tuple[float, ...] = ()  # Snapshot of the last five CPU samples
     net_bytes_sent: int = 0
     net_bytes_recv: int = 0
     net_bytes_total: int = 0
     disk_total_bytes: int = 0
     disk_current_bytes: int = 0  # Current cycle activity
+    disk_read_bytes: int = 0  # Lifetime counters, where the platform reports them
+    disk_write_bytes: int = 0
     connections_count: int = 0
     mcp_connections: int = 0
 
+# Sort keys for the process list, as C-level attribute getters
+SORT_KEYS = {
+    'pid': attrgetter('pid'),
+    'cpu': attrgetter('cpu_percent'),
+    'memory': attrgetter('memory_mb'),
+    'net_out': attrgetter('net_bytes_sent'),
+    'net_in': attrgetter('net_bytes_recv'),
+    'net_total': attrgetter('net_bytes_total'),
+    'disk_total': attrgetter('disk_total_bytes'),
+    'disk_current': attrgetter('disk_current_bytes'),
+    'connections': attrgetter('connections_count'),
+    'time': attrgetter('start_time')
+}
+
+# Remote ports that suggest an MCP server connection
+MCP_PORTS = frozenset({3000, 8000, 8080, 9000})
+
+# Calls to find_claude_processes closer together than this reuse the last scan
+MIN_POLL_INTERVAL = 0.25
+# Idle and waiting processes are fully re-read on a backoff schedule that grows
+# by IDLE_BACKOFF_FACTOR per quiet refresh, up to IDLE_POLL_CEILING seconds;
+# CPU use above IDLE_WAKE_CPU percent brings them back to every refresh
+IDLE_BACKOFF_FACTOR = 1.5
+IDLE_POLL_CEILING = 15.0
+IDLE_WAKE_CPU = 0.5
+# Seconds between open_files()/net_connections() reads for the same process
+CONNECTION_REFRESH_INTERVAL = 5.0
+# Per-process disk counters exist everywhere but macOS; open_files() only feeds
+# the disk estimate used without them, so it is skipped where they exist
+PROC_IO_COUNTERS = hasattr(psutil.Process, 'io_counters')
+
+# On Linux, /proc/<pid>/cmdline can be read directly to rule out non-Claude
+# processes before any psutil.Process is built for them
+LINUX_PROCFS = sys.platform == 'linux'
+CLOCK_TICKS = os.sysconf('SC_CLK_TCK') if LINUX_PROCFS else 100
+PF_KTHREAD = 0x00200000  # per-process flags bit set on kernel threads
+
+def cmdline_mentions_claude(pid: int) -> Optional[bool]:
+    """Cheap pre-check on the raw Linux cmdline of a process
+    
+    /proc/<pid>/comm would be a smaller read, but for a CLI started through an
+    interpreter it only names node or python, so it cannot rule processes out.
+    Returns None instead of False when the cmdline is empty, which marks a
+    kernel thread or a zombie.
+    """
+    try:
+        fd = os.open(f'/proc/{pid}/cmdline', os.O_RDONLY)
+    except OSError:
+        return False
+    try:
+        # Raw os.read() calls skip the buffered file object, whose setup costs
+        # more than reading a file this small; a match ends the read early
+        cmdline = b''
+        while True:
+            chunk = os.read(fd, 65536)
+            if not chunk:
+                return False if cmdline else None
+            cmdline += chunk
+            if b'claude' in cmdline.lower():
+                return True
+    except OSError:
+        return False
+    finally:
+        os.close(fd)
+
+def is_kernel_thread(pid: int) -> bool:
+    """Check the PF_KTHREAD flag in /proc/<pid>/stat
+    
+    Kernel threads live without a cmdline for good, unlike zombies, whose
+    PID can be reaped and handed to a new process between two scans.
+    """
+    try:
+        with open(f'/proc/{pid}/stat', 'rb') as f:
+            stat = f.read()
+        # comm may contain spaces and parentheses, so split after the last ')'
+        flags = int(stat[stat.rfind(b')') + 2:].split()[6])
+    except (OSError, ValueError, IndexError):
+        return False
+    return bool(flags & PF_KTHREAD)
+
 class ClaudeMonitor:
     def __init__(self):
         self.instances: List[ClaudeInstance] = []
@@ -40,65 +141,185 @@ class ClaudeMonitor:
         self.reverse_sort = False
         self.show_full_path = False
         self.cpu_histories = {}  # Track CPU history for each PID
+        self._proc_cache = {}  # pid -> psutil.Process reused across refreshes
+        self._stat_fds = {}  # pid -> open /proc/<pid>/stat descriptor for cached processes
+        self._io_fds = {}  # pid -> open /proc/<pid>/io descriptor for Claude processes
+        self._classification_cache = {}  # (pid, create_time) -> is Claude CLI
+        self._start_times = {}  # (pid, create_time) -> start datetime
+        self._cmdlines = {}  # (pid, create_time) -> cmdline of a Claude CLI process
+        self._cwds = {}  # (pid, create_time) -> working directory read on first sight
+        self._argless_pids = set()  # Kernel threads, never re-read on Linux
+        self._cpu_samples = {}  # pid -> (sampled_at, cpu_seconds, cpu_percent)
+        self._connection_cache = {}  # pid -> (read_at, open_files, connections, mcp_connections)
+        self.visible_pids = None  # PIDs on screen; None keeps every process fresh
+        self._last_poll = None  # monotonic time of the last full scan
+        self._last_result = []
+        self._idle_backoff = {}  # pid -> (next_full_read, interval) for idle/waiting processes
+        self.io_tracker = {}  # pid -> activity indicators from the previous refresh
+        self._spare_indicators = {}  # pid -> retired indicators dict, refilled next refresh
+        self.io_totals = {}  # pid -> cumulative estimated I/O
+        # Threads, not processes: enrichment is I/O-bound on /proc reads
+        self._enrich_pool = ThreadPoolExecutor(max_workers=min(32, (os.cpu_count() or 1) * 4))
         
         # Alert configuration
         self.alerts_enabled = True
         self.cpu_threshold = 80.0  # Alert when CPU > 80%
         self.memory_threshold = 1000.0  # Alert when memory > 1GB
-        self.alert_history = {}  # pid -> {'cpu': timestamp, 'memory': timestamp}
+        self.cpu_alert_times = {}  # pid -> time of the last CPU alert
+        self.memory_alert_times = {}  # pid -> time of the last memory alert
         self.alert_cooldown = 60  # Don't repeat same alert for 60 seconds
         
     def find_claude_processes(self):
         """Find all Claude CLI processes running on the system"""
-        claude_processes = []
+        now = time.monotonic()
+        if self._last_poll is not None and now - self._last_poll < MIN_POLL_INTERVAL:
+            return self._last_result
+        self._last_poll = now
+        
+        matches = []
         current_pid = os.getpid()  # Get current process PID
         
-        for proc in psutil.process_iter(['pid', 'name', 'cmdline', 'cwd', 'create_time', 'cpu_percent', 'memory_info']):
+        live_pids = psutil.pids()
+        for pid in live_pids:
             try:
                 # Skip our own process
-                if proc.info['pid'] == current_pid:
+                if pid == current_pid:
                     continue
                 
-                # Check if this is a Claude CLI process
-                cmdline = proc.info.get('cmdline', [])
-                if cmdline and any('claude' in cmd.lower() for cmd in cmdline):
-                    # Filter out non-CLI Claude processes
-                    cmdline_str = ' '.join(cmdline)
-                    
-                    # Skip Claude desktop app processes
-                    if 'Claude.app' in cmdline_str or 'Claude Helper' in cmdline_str or 'chrome_crashpad' in cmdline_str or 'Squirrel' in cmdline_str:
+                # Most processes are ruled out from their raw cmdline alone; a kernel
+                # thread can never turn into a Claude CLI, so it is not read again
+                if LINUX_PROCFS and pid not in self._proc_cache:
+                    if pid in self._argless_pids:
                         continue
-                        
-                    # Skip claude-top itself (additional check by command)
-                    if 'claude-top' in cmdline_str or './claude-top' in cmdline_str:
+                    mentions_claude = cmdline_mentions_claude(pid)
+                    if not mentions_claude:
+                        if mentions_claude is None and is_kernel_thread(pid):
+                            self._argless_pids.add(pid)
                         continue
-                        
-                    # Skip docker processes unless they're Claude-related containers
-                    if 'docker' in cmdline_str and 'mcp/filesystem' in cmdline_str:
-                        continue
-                    
-                    # Extract relevant information
-                    instance = self.parse_claude_process(proc)
-                    if instance:
-                        claude_processes.append(instance)
+                
+                # Reuse the Process from earlier refreshes unless the PID was recycled,
+                # so cpu_percent deltas and cached attributes carry over between cycles
+                proc = self._proc_cache.get(pid)
+                if proc is None or not self.is_same_process(proc):
+                    proc = self._proc_cache[pid] = psutil.Process(pid)
+                    if LINUX_PROCFS:
+                        self.read_proc_stat(pid)  # Bind a descriptor to this process
+                
+                # cmdline never changes over a process's lifetime, so classify each one
+                # once and keep the cmdline of matches rather than re-reading it per refresh
+                key = (pid, proc.create_time())
+                is_claude_cli = self._classification_cache.get(key)
+                if is_claude_cli is None:
+                    is_claude_cli = self._classification_cache[key] = self.is_claude_cli(proc.cmdline())
+                if not is_claude_cli:
+                    continue
+                
+                cmdline = self._cmdlines.get(key)
+                if cmdline is None:
+                    cmdline = self._cmdlines[key] = proc.cmdline()
+                proc.info = {'pid': pid, 'cmdline': cmdline}
+                matches.append(proc)
             except (psutil.NoSuchProcess, psutil.AccessDenied):
                 continue
+        
+        # Forget Process objects and verdicts for PIDs that have exited
+        live_pids = set(live_pids)
+        for pid in self._proc_cache.keys() - live_pids:
+            del self._proc_cache[pid]
+        for pid in self._stat_fds.keys() - live_pids:
+            os.close(self._stat_fds.pop(pid))
+        for pid in self._io_fds.keys() - live_pids:
+            os.close(self._io_fds.pop(pid))
+        self._argless_pids.intersection_update(live_pids)
+        for key in [key for key in self._classification_cache if key[0] not in live_pids]:
+            del self._classification_cache[key]
+        for key in [key for key in self._start_times if key[0] not in live_pids]:
+            del self._start_times[key]
+        for key in [key for key in self._cmdlines if key[0] not in live_pids]:
+            del self._cmdlines[key]
+        for key in [key for key in self._cwds if key[0] not in live_pids]:
+            del self._cwds[key]
+        for pid in self._connection_cache.keys() - live_pids:
+            del self._connection_cache[pid]
+        for pid in self.io_tracker.keys() - live_pids:
+            del self.io_tracker[pid]
+        for pid in self._spare_indicators.keys() - live_pids:
+            del self._spare_indicators[pid]
+        for pid in self.io_totals.keys() - live_pids:
+            del self.io_totals[pid]
+        for pid in self._cpu_samples.keys() - live_pids:
+            del self._cpu_samples[pid]
+        for pid in self._idle_backoff.keys() - live_pids:
+            del self._idle_backoff[pid]
+        for pid in self.cpu_histories.keys() - live_pids:
+            del self.cpu_histories[pid]
+        # A recycled PID must not come back reported as paused
+        self.paused_pids.intersection_update(live_pids)
+        
+        # Quiet processes inside their backoff window keep their previous snapshot
+        # object as is, so a steady idle session allocates no new instance
+        previous = {instance.pid: instance for instance in self._last_result} if self._idle_backoff else {}
+        instances = {}
+        to_parse = []
+        for proc in matches:
+            if proc.pid in previous and self.in_idle_backoff(proc, now):
+                instances[proc.pid] = previous[proc.pid]
+            else:
+                to_parse.append(proc)
+        
+        # Extract relevant information; the /proc reads behind it release the GIL,
+        # so a shared thread pool overlaps them when several instances are running
+        if len(to_parse) > 1:
+            parsed = self._enrich_pool.map(self.parse_process_snapshot, to_parse)
+        else:
+            parsed = map(self.parse_process_snapshot, to_parse)
+        parsed = [instance for instance in parsed if instance]
+        self.update_idle_backoff(parsed, now)
+        
+        # Keep the scan order, dropping processes that vanished while being parsed
+        instances.update((instance.pid, instance) for instance in parsed)
+        claude_processes = [instances[proc.pid] for proc in matches if proc.pid in instances]
+        self._last_result = claude_processes
                 
         return claude_processes
     
+    def is_claude_cli(self, cmdline: List[str]) -> bool:
+        """Check whether a command line belongs to a Claude CLI process"""
+        cmdline_str = ' '.join(cmdline)
+        if not _CLAUDE_RE.search(cmdline_str):
+            return False
+        
+        # Filter out non-CLI Claude processes: the desktop app, claude-top itself
+        # and docker-run MCP servers
+        return not _EXCLUDE_RE.search(cmdline_str)
+    
+    def parse_process_snapshot(self, proc) -> Optional[ClaudeInstance]:
+        """Parse a process under oneshot(), so the status, memory and CPU
+        lookups share a single read of each /proc file"""
+        with proc.oneshot():
+            return self.parse_claude_process(proc)
+    
     def parse_claude_process(self, proc) -> Optional[ClaudeInstance]:
         """Parse process information to create ClaudeInstance"""
         try:
+            # Only pid/cmdline come from process_iter; the rest is read for matches only
             info = proc.info
+            info.update(proc.as_dict(['memory_info']))
             pid = info['pid']
-            # Get working directory - try multiple methods
-            cwd = info.get('cwd', None)
-            if not cwd or cwd == '/':
-                try:
-                    # Try to get cwd directly from process
-                    cwd = proc.cwd()
-                except (psutil.NoSuchProcess, psutil.AccessDenied):
-                    cwd = 'Unknown'
+            # A session stays in the directory it was started from, so read it once
+            key = (pid, proc.create_time())
+            cwd = self._cwds.get(key)
+            if cwd is None:
+                # Get working directory - try multiple methods
+                cwd = proc.as_dict(['cwd']).get('cwd')
+                if not cwd or cwd == '/':
+                    try:
+                        # Try to get cwd directly from process
+                        cwd = proc.cwd()
+                    except (psutil.NoSuchProcess, psutil.AccessDenied):
+                        cwd = 'Unknown'
+                if cwd != 'Unknown':
+                    self._cwds[key] = cwd
             
             cmdline = ' '.join(info.get('cmdline', []))
             
@@ -108,16 +329,18 @@ class ClaudeMonitor:
             # Get context and token information (would need to read from Claude's state files)
             context_length, tokens_used = self.get_claude_metrics(pid, cwd)
             
-            # Initialize CPU history for new processes
-            if pid not in self.cpu_histories:
-                self.cpu_histories[pid] = deque(maxlen=5)
+            # One read of the kept-open stat descriptor serves both CPU times and state
+            stat_fields = self.read_stat_fields(pid) if LINUX_PROCFS else None
             
-            # Update CPU history
-            current_cpu = info.get('cpu_percent', 0.0)
-            self.cpu_histories[pid].append(current_cpu)
+            # Update CPU history, initializing it for new processes
+            current_cpu = self.sample_cpu_percent(proc, stat_fields=stat_fields)
+            cpu_history = self.cpu_histories.get(pid)
+            if cpu_history is None:
+                cpu_history = self.cpu_histories[pid] = deque(maxlen=5)
+            cpu_history.append(current_cpu)
             
             # Determine status based on CPU usage patterns
-            status = self.determine_process_status(pid, proc)
+            status = self.determine_process_status(pid, proc, stat_fields)
             
             # Get network and disk I/O statistics
             net_io, disk_io, connections_info = self.get_io_stats(proc)
@@ -128,24 +351,144 @@ class ClaudeMonitor:
                 task=task,
                 context_length=context_length,
                 tokens_used=tokens_used,
-                start_time=datetime.fromtimestamp(info['create_time']),
+                start_time=self.get_start_time(proc),
                 status=status,
-                cpu_percent=info.get('cpu_percent', 0.0),
+                cpu_percent=current_cpu,
                 memory_mb=info.get('memory_info').rss / 1024 / 1024 if info.get('memory_info') else 0,
                 command=cmdline,
-                cpu_history=self.cpu_histories[pid].copy(),
+                # A snapshot, not the live deque: the next scan appends to that one
+                # while this instance may still be drawn or reused by idle backoff.
+                # A tuple is a tenth the size of a deque copy and cheaper to build
+                cpu_history=tuple(cpu_history),
                 net_bytes_sent=net_io['bytes_sent'],
                 net_bytes_recv=net_io['bytes_recv'],
                 net_bytes_total=net_io['bytes_total'],
                 disk_total_bytes=disk_io['total_bytes'],
                 disk_current_bytes=disk_io['current_bytes'],
+                disk_read_bytes=disk_io['read_bytes'],
+                disk_write_bytes=disk_io['write_bytes'],
                 connections_count=connections_info['total_connections'],
                 mcp_connections=connections_info['mcp_connections']
             )
         except Exception:
             return None
     
-    def determine_process_status(self, pid, proc):
+    def read_proc_stat(self, pid: int) -> Optional[bytes]:
+        """Read /proc/<pid>/stat through a descriptor kept open across refreshes
+        
+        The descriptor stays bound to the process it was opened for, so once that
+        process has been reaped reads fail even if the pid has been reused.
+        Returns None when the process is gone.
+        """
+        fd = self._stat_fds.get(pid)
+        if fd is None:
+            try:
+                fd = self._stat_fds[pid] = os.open(f'/proc/{pid}/stat', os.O_RDONLY)
+            except OSError:
+                return None
+        try:
+            return os.pread(fd, 4096, 0)
+        except OSError:
+            os.close(self._stat_fds.pop(pid))
+            return None
+    
+    def read_proc_io(self, pid: int) -> Optional[Tuple[int, int]]:
+        """Read (read_bytes, write_bytes) from /proc/<pid>/io through a kept-open descriptor
+        
+        Like read_proc_stat, this skips the open and close psutil's io_counters()
+        does on every call. Returns None when the process is gone or the
+        counters are not readable.
+        """
+        fd = self._io_fds.get(pid)
+        if fd is None:
+            try:
+                fd = self._io_fds[pid] = os.open(f'/proc/{pid}/io', os.O_RDONLY)
+            except OSError:
+                return None
+        try:
+            fields = os.pread(fd, 4096, 0).split()
+            read_at = fields.index(b'read_bytes:') + 1
+            write_at = fields.index(b'write_bytes:') + 1
+            return int(fields[read_at]), int(fields[write_at])
+        except (OSError, ValueError, IndexError):
+            os.close(self._io_fds.pop(pid))
+            return None
+    
+    def read_stat_fields(self, pid: int) -> Optional[List[bytes]]:
+        """Split /proc/<pid>/stat after the command name: the state letter first,
+        then the numeric fields. Returns None when the process is gone."""
+        stat = self.read_proc_stat(pid)
+        if stat is None:
+            return None
+        # comm may contain spaces and parentheses, so split after the last ')'
+        return stat[stat.rfind(b')') + 2:].split()
+    
+    def is_same_process(self, proc) -> bool:
+        """Check that a cached Process still refers to a running process"""
+        if LINUX_PROCFS:
+            # One pread() instead of psutil rebuilding the process to compare it
+            return self.read_proc_stat(proc.pid) is not None
+        return proc.is_running()
+    
+    def in_idle_backoff(self, proc, now: float) -> bool:
+        """Check whether an idle process can skip this refresh's full read"""
+        backoff = self._idle_backoff.get(proc.pid)
+        if not backoff or now >= backoff[0]:
+            return False
+        try:
+            # Peek at CPU use since the last full read without resetting its baseline
+            return self.sample_cpu_percent(proc, record=False) <= IDLE_WAKE_CPU
+        except psutil.Error:
+            return False
+    
+    def update_idle_backoff(self, instances, now: float):
+        """Lengthen the full-read interval of quiet processes, reset busy ones"""
+        base_interval = max(self.update_interval, MIN_POLL_INTERVAL)
+        for instance in instances:
+            if instance.status in ('idle', 'waiting'):
+                _, interval = self._idle_backoff.get(instance.pid, (now, base_interval))
+                interval = min(interval * IDLE_BACKOFF_FACTOR, IDLE_POLL_CEILING)
+                self._idle_backoff[instance.pid] = (now + interval, interval)
+            else:
+                self._idle_backoff.pop(instance.pid, None)
+    
+    def get_start_time(self, proc) -> datetime:
+        """Process start time, converted to a datetime once per process"""
+        key = (proc.pid, proc.create_time())
+        start_time = self._start_times.get(key)
+        if start_time is None:
+            start_time = self._start_times[key] = datetime.fromtimestamp(key[1])
+        return start_time
+    
+    def sample_cpu_percent(self, proc, record: bool = True, stat_fields=None) -> float:
+        """CPU usage since the previous refresh, from the process's own CPU times
+        
+        Uses the same scale as psutil's cpu_percent (100% = one full core) but
+        only needs the process's stat entry, not a system-wide CPU times read.
+        With record=False the sample is not kept as the next baseline.
+        stat_fields may pass in a read_stat_fields() result already taken.
+        """
+        if LINUX_PROCFS:
+            fields = stat_fields or self.read_stat_fields(proc.pid)
+            if fields is None:
+                raise psutil.NoSuchProcess(proc.pid)
+            # utime and stime are fields 14 and 15 of the stat line
+            cpu_seconds = (int(fields[11]) + int(fields[12])) / CLOCK_TICKS
+        else:
+            cpu_times = proc.cpu_times()
+            cpu_seconds = cpu_times.user + cpu_times.system
+        now = time.monotonic()
+        
+        percent = 0.0
+        previous = self._cpu_samples.get(proc.pid)
+        if previous and now > previous[0]:
+            percent = round(max(0.0, cpu_seconds - previous[1]) / (now - previous[0]) * 100, 1)
+        
+        if record:
+            self._cpu_samples[proc.pid] = (now, cpu_seconds, percent)
+        return percent
+    
+    def determine_process_status(self, pid, proc, stat_fields=None):
         """Determine process status based on CPU usage patterns
         
         States:
@@ -158,34 +501,36 @@ class ClaudeMonitor:
         if pid in self.paused_pids:
             return 'paused'
         
-        # Check system status
-        sys_status = proc.status()
-        if sys_status == 'stopped':
+        # Check system status; on Linux this is the state letter from /proc/<pid>/stat,
+        # taken from the fields already read for the CPU sample when given
+        if stat_fields:
+            if stat_fields[0] == b'T':
+                return 'paused'
+        elif proc.status() == 'stopped':
             return 'paused'
         
-        # Analyze CPU history
-        cpu_samples = list(self.cpu_histories[pid])
-        if len(cpu_samples) >= 3:
-            avg_cpu = sum(cpu_samples) / len(cpu_samples)
-            max_cpu = max(cpu_samples)
-            recent_cpu = cpu_samples[-1] if cpu_samples else 0
+        # Analyze CPU history, reading the deque in place rather than copying it
+        cpu_samples = self.cpu_histories[pid]
+        sample_count = len(cpu_samples)
+        if sample_count >= 3:
+            # Each figure is only worked out once the cheaper checks above it
+            # have failed to settle the status; averages are compared as totals
+            # against threshold * count, which spares the divisions
+            if sum(cpu_samples) > 5.0 * sample_count:
+                return 'running'  # Actively processing
             
             # Check patterns in CPU history
-            recent_samples = cpu_samples[-3:] if len(cpu_samples) >= 3 else cpu_samples
-            recent_avg = sum(recent_samples) / len(recent_samples) if recent_samples else 0
+            recent_cpu = cpu_samples[-1]
+            recent_samples = (cpu_samples[-3], cpu_samples[-2], recent_cpu)
             
-            # Look for transition from active to idle (indicates waiting)
-            had_activity = any(sample > 3.0 for sample in cpu_samples[:-2]) if len(cpu_samples) > 2 else False
-            now_idle = recent_avg < 0.5
-            
-            if avg_cpu > 5.0:
-                return 'running'  # Actively processing
-            elif recent_avg < 0.5:
-                # Very low recent CPU
-                if had_activity and max_cpu > 3.0:
+            if sum(recent_samples) < 1.5:
+                # Very low recent CPU; look for a transition from active to idle
+                # (an earlier sample above 3% also means the peak was above 3%)
+                had_activity = any(sample > 3.0 for sample in islice(cpu_samples, sample_count - 2))
+                if had_activity:
                     # Had significant activity before becoming idle - waiting for input
                     return 'waiting'
-                elif recent_cpu > 0.2 or any(s > 0.5 for s in recent_samples):
+                elif recent_cpu > 0.2 or max(recent_samples) > 0.5:
                     # Still has minimal activity - likely waiting
                     return 'waiting'
                 else:
@@ -217,27 +562,30 @@ class ClaudeMonitor:
         try:
             pid = proc.pid
             
-            # Initialize I/O tracker if not exists
-            if not hasattr(self, 'io_tracker'):
-                self.io_tracker = {}
-            if not hasattr(self, 'io_totals'):
-                self.io_totals = {}
+            # Get current activity indicators, refilling the dict retired last refresh
+            current_indicators = self.get_activity_indicators(proc, self._spare_indicators.pop(pid, None))
             
-            # Get current activity indicators
-            current_indicators = self.get_activity_indicators(proc)
+            disk_read = current_indicators['disk_read_bytes']
+            disk_write = current_indicators['disk_write_bytes']
+            has_disk_counters = disk_read is not None
             
             # Calculate I/O estimates based on activity changes
             if pid in self.io_tracker:
                 prev_indicators = self.io_tracker[pid]
                 
-                # Memory delta often indicates I/O activity
-                memory_delta = current_indicators.get('memory_usage', 0) - prev_indicators.get('memory_usage', 0)
-                files_delta = current_indicators.get('open_files', 0) - prev_indicators.get('open_files', 0)
-                
-                # Estimate current cycle disk I/O
-                estimated_write = max(0, memory_delta // 10)  # Memory growth -> writes
-                estimated_read = abs(files_delta) * 1024  # File activity -> reads
-                current_disk_io = estimated_write + estimated_read
+                if has_disk_counters and prev_indicators.get('disk_read_bytes') is not None:
+                    # Real disk traffic since the previous refresh
+                    current_disk_io = (disk_read + disk_write - prev_indicators['disk_read_bytes']
+                                       - prev_indicators['disk_write_bytes'])
+                else:
+                    # Memory delta often indicates I/O activity
+                    memory_delta = current_indicators.get('memory_usage', 0) - prev_indicators.get('memory_usage', 0)
+                    files_delta = current_indicators.get('open_files', 0) - prev_indicators.get('open_files', 0)
+                    
+                    # Estimate current cycle disk I/O
+                    estimated_write = max(0, memory_delta // 10)  # Memory growth -> writes
+                    estimated_read = abs(files_delta) * 1024  # File activity -> reads
+                    current_disk_io = estimated_write + estimated_read
                 
                 # Network estimation based on connection activity and CPU
                 conn_count = current_indicators.get('network_connections', 0)
@@ -276,13 +624,22 @@ class ClaudeMonitor:
                         'total_net_sent': 0, 'total_net_recv': 0, 'total_disk': 0
                     }
             
-            # Store current indicators for next comparison
+            # Real counters replace the estimated total with the process's lifetime traffic
+            if has_disk_counters:
+                disk_stats['total_bytes'] = disk_read + disk_write
+            disk_stats['read_bytes'] = disk_read or 0
+            disk_stats['write_bytes'] = disk_write or 0
+            
+            # Store current indicators for next comparison; the previous ones become the spare
+            prev_indicators = self.io_tracker.get(pid)
+            if prev_indicators is not None:
+                self._spare_indicators[pid] = prev_indicators
             self.io_tracker[pid] = current_indicators
             
             # Connection analysis
             connections_info = {
                 'total_connections': current_indicators.get('network_connections', 0),
-                'mcp_connections': self.detect_mcp_connections(proc)
+                'mcp_connections': current_indicators.get('mcp_connections', 0)
             }
             
             return net_stats, disk_stats, connections_info
@@ -290,49 +647,81 @@ class ClaudeMonitor:
         except Exception:
             # Return default values on any error
             return ({'bytes_sent': 0, 'bytes_recv': 0, 'bytes_total': 0}, 
-                   {'total_bytes': 0, 'current_bytes': 0},
+                   {'total_bytes': 0, 'current_bytes': 0, 'read_bytes': 0, 'write_bytes': 0},
                    {'total_connections': 0, 'mcp_connections': 0})
     
-    def get_activity_indicators(self, proc):
-        """Get activity indicators for a process"""
-        indicators = {
-            'memory_usage': 0,
-            'open_files': 0,
-            'threads': 0,
-            'network_connections': 0,
-            'cpu_percent': 0
-        }
+    def get_activity_indicators(self, proc, indicators=None):
+        """Get activity indicators for a process, filling indicators if given"""
+        if indicators is None:
+            indicators = {}
+        indicators.update(memory_usage=0, open_files=0,
+                          network_connections=0, mcp_connections=0, cpu_percent=0,
+                          disk_read_bytes=None, disk_write_bytes=None)
         
         try:
-            # Memory usage
-            memory_info = proc.memory_info()
-            indicators['memory_usage'] = memory_info.rss
-            
-            # CPU usage
-            indicators['cpu_percent'] = proc.cpu_percent()
+            # Disk counters; macOS has no per-process io_counters()
+            if LINUX_PROCFS:
+                disk_io = self.read_proc_io(proc.pid)
+                if disk_io is not None:
+                    indicators['disk_read_bytes'], indicators['disk_write_bytes'] = disk_io
+            elif PROC_IO_COUNTERS:
+                try:
+                    io_counters = proc.io_counters()
+                    indicators['disk_read_bytes'] = io_counters.read_bytes
+                    indicators['disk_write_bytes'] = io_counters.write_bytes
+                except psutil.AccessDenied:
+                    pass
             
-            # Thread count
-            indicators['threads'] = proc.num_threads()
+            # Memory growth only feeds the disk estimate used without real counters;
+            # reuse the reading parse_claude_process already took where there is one
+            if indicators['disk_read_bytes'] is None:
+                memory_info = getattr(proc, 'info', {}).get('memory_info') or proc.memory_info()
+                indicators['memory_usage'] = memory_info.rss
             
-            # Open files count
-            try:
-                open_files = proc.open_files()
-                indicators['open_files'] = len(open_files)
-            except psutil.AccessDenied:
-                pass
+            # CPU usage
+            indicators['cpu_percent'] = self._cpu_samples.get(proc.pid, (0, 0, 0.0))[2]
             
-            # Network connections
-            try:
-                connections = proc.net_connections()
-                indicators['network_connections'] = len(connections)
-            except psutil.AccessDenied:
-                pass
+            # Open files and network connections
+            (indicators['open_files'], indicators['network_connections'],
+             indicators['mcp_connections']) = self.get_connection_indicators(proc)
                 
         except psutil.NoSuchProcess:
             pass
         
         return indicators
     
+    def get_connection_indicators(self, proc):
+        """Get open file, connection and MCP connection counts for a process
+        
+        These are the costliest psutil lookups and rarely change between
+        refreshes, so they are re-read at most every CONNECTION_REFRESH_INTERVAL
+        seconds, and only for processes currently on screen.
+        """
+        pid = proc.pid
+        now = time.monotonic()
+        cached = self._connection_cache.get(pid)
+        if cached and (now - cached[0] < CONNECTION_REFRESH_INTERVAL or
+                       (self.visible_pids is not None and pid not in self.visible_pids)):
+            return cached[1:]
+        
+        open_files = connection_count = mcp_connections = 0
+        if not PROC_IO_COUNTERS:
+            try:
+                open_files = len(proc.open_files())
+            except psutil.AccessDenied:
+                pass
+        
+        try:
+            # One TCP/UDP read serves both the count and MCP detection; UNIX sockets are skipped
+            connections = proc.net_connections(kind='inet')
+            connection_count = len(connections)
+            mcp_connections = self.detect_mcp_connections(connections)
+        except psutil.AccessDenied:
+            pass
+        
+        self._connection_cache[pid] = (now, open_files, connection_count, mcp_connections)
+        return open_files, connection_count, mcp_connections
+    
     def calculate_summary_stats(self, instances):
         """Calculate comprehensive summary statistics for all Claude instances"""
         if not instances:
@@ -345,13 +734,34 @@ class ClaudeMonitor:
                 'historical_averages': {'cpu': 0, 'memory': 0, 'sessions': 0}
             }
         
+        # Accumulate every figure in a single pass over the instances
+        net_in = net_out = net_total = disk_total = disk_current = 0
+        cpu_total = memory_total = memory_peak = 0
+        total_connections = with_mcp = 0
+        status_counts = dict.fromkeys(('running', 'idle', 'waiting', 'paused'), 0)
+        for inst in instances:
+            net_in += inst.net_bytes_recv
+            net_out += inst.net_bytes_sent
+            net_total += inst.net_bytes_total
+            disk_total += inst.disk_total_bytes
+            disk_current += inst.disk_current_bytes
+            cpu_total += inst.cpu_percent
+            memory_total += inst.memory_mb
+            if inst.memory_mb > memory_peak:
+                memory_peak = inst.memory_mb
+            total_connections += inst.connections_count
+            if inst.mcp_connections > 0:
+                with_mcp += 1
+            if inst.status in status_counts:
+                status_counts[inst.status] += 1
+        
         # Session totals (cumulative across all processes)
         session_totals = {
-            'net_in': sum(inst.net_bytes_recv for inst in instances),
-            'net_out': sum(inst.net_bytes_sent for inst in instances), 
-            'net_total': sum(inst.net_bytes_total for inst in instances),
-            'disk_total': sum(inst.disk_total_bytes for inst in instances),
-            'disk_current': sum(inst.disk_current_bytes for inst in instances)
+            'net_in': net_in,
+            'net_out': net_out, 
+            'net_total': net_total,
+            'disk_total': disk_total,
+            'disk_current': disk_current
         }
         
         # Current rates (current cycle activity)
@@ -362,29 +772,27 @@ class ClaudeMonitor:
         }
         
         # CPU statistics
-        cpu_values = [inst.cpu_percent for inst in instances]
         cpu_stats = {
-            'current': sum(cpu_values),
-            'average': sum(cpu_values) / len(cpu_values) if cpu_values else 0,
-            'count_running': sum(1 for inst in instances if inst.status == 'running'),
-            'count_idle': sum(1 for inst in instances if inst.status == 'idle'),
-            'count_waiting': sum(1 for inst in instances if inst.status == 'waiting'),
-            'count_paused': sum(1 for inst in instances if inst.status == 'paused')
+            'current': cpu_total,
+            'average': cpu_total / len(instances),
+            'count_running': status_counts['running'],
+            'count_idle': status_counts['idle'],
+            'count_waiting': status_counts['waiting'],
+            'count_paused': status_counts['paused']
         }
         
         # Memory statistics
-        memory_values = [inst.memory_mb for inst in instances]
         memory_stats = {
-            'current': sum(memory_values),
-            'average': sum(memory_values) / len(memory_values) if memory_values else 0,
-            'peak': max(memory_values) if memory_values else 0
+            'current': memory_total,
+            'average': memory_total / len(instances),
+            'peak': memory_peak
         }
         
         # Process statistics
         process_stats = {
             'total': len(instances),
-            'with_mcp': sum(1 for inst in instances if inst.mcp_connections > 0),
-            'total_connections': sum(inst.connections_count for inst in instances)
+            'with_mcp': with_mcp,
+            'total_connections': total_connections
         }
         
         # Historical averages (placeholder for core module)
@@ -399,25 +807,32 @@ class ClaudeMonitor:
             'historical_averages': historical_averages
         }
     
-    def detect_mcp_connections(self, proc):
-        """Detect potential MCP connections"""
+    def detect_mcp_connections(self, connections):
+        """Detect potential MCP connections among a process's connections"""
         try:
-            connections = proc.net_connections()
+            # Heuristic for MCP: WebSocket-like ports or specific patterns; the
+            # status test comes first since most connections are not established,
+            # and each address is looked up once
+            established = psutil.CONN_ESTABLISHED
             mcp_count = 0
-            
             for conn in connections:
-                if conn.status == 'ESTABLISHED':
-                    # Heuristic for MCP: WebSocket-like ports or specific patterns
-                    if (conn.raddr and conn.raddr.port in [8000, 8080, 3000, 9000] or
-                        (conn.laddr and conn.laddr.port > 8000)):
+                if conn.status != established:
+                    continue
+                raddr = conn.raddr
+                if raddr and raddr.port in MCP_PORTS:
+                    mcp_count += 1
+                else:
+                    laddr = conn.laddr
+                    if laddr and laddr.port > 8000:
                         mcp_count += 1
-            
             return mcp_count
-        except (psutil.AccessDenied, AttributeError):
+        except AttributeError:
             return 0
 
     def pause_resume_process(self, pid: int):
         """Pause or resume a process"""
+        # Re-read the process on the next refresh so its new state shows up at once
+        self._idle_backoff.pop(pid, None)
         try:
             if pid in self.paused_pids:
                 os.kill(pid, signal.SIGCONT)
@@ -455,21 +870,8 @@ class ClaudeMonitor:
         if not self.instances:
             return
         
-        sort_map = {
-            'pid': lambda x: x.pid,
-            'cpu': lambda x: x.cpu_percent,
-            'memory': lambda x: x.memory_mb,
-            'net_out': lambda x: x.net_bytes_sent,
-            'net_in': lambda x: x.net_bytes_recv,
-            'net_total': lambda x: x.net_bytes_total,
-            'disk_total': lambda x: x.disk_total_bytes,
-            'disk_current': lambda x: x.disk_current_bytes,
-            'connections': lambda x: x.connections_count,
-            'time': lambda x: x.start_time
-        }
-        
-        if self.sort_key in sort_map:
-            self.instances.sort(key=sort_map[self.sort_key], reverse=self.reverse_sort)
+        if self.sort_key in SORT_KEYS:
+            self.instances.sort(key=SORT_KEYS[self.sort_key], reverse=self.reverse_sort)
     
     def check_resource_alerts(self):
         """Check for processes exceeding resource thresholds"""
@@ -480,41 +882,46 @@ class ClaudeMonitor:
         alerts = []
         current_time = time.time()
         
+        cpu_threshold = self.cpu_threshold
+        memory_threshold = self.memory_threshold
+        
         for instance in self.instances:
-            pid = instance.pid
+            # Most processes are under both thresholds; only those over one
+            # touch the alert times
+            cpu_hot = instance.cpu_percent > cpu_threshold
+            memory_hot = instance.memory_mb > memory_threshold
+            if not (cpu_hot or memory_hot):
+                continue
             
-            # Initialize alert history for new processes
-            if pid not in self.alert_history:
-                self.alert_history[pid] = {'cpu': 0, 'memory': 0}
+            pid = instance.pid
             
             # Check CPU threshold
-            if instance.cpu_percent > self.cpu_threshold:
-                last_alert = self.alert_history[pid]['cpu']
-                if current_time - last_alert > self.alert_cooldown:
-                    alerts.append({
-                        'type': 'cpu',
-                        'pid': pid,
-                        'process': instance.working_dir.split('/')[-1],
-                        'value': instance.cpu_percent,
-                        'threshold': self.cpu_threshold
-                    })
-                    self.alert_history[pid]['cpu'] = current_time
+            if cpu_hot and current_time - self.cpu_alert_times.get(pid, 0) > self.alert_cooldown:
+                alerts.append({
+                    'type': 'cpu',
+                    'pid': pid,
+                    'process': instance.working_dir.rpartition('/')[2],
+                    'value': instance.cpu_percent,
+                    'threshold': cpu_threshold
+                })
+                self.cpu_alert_times[pid] = current_time
             
             # Check memory threshold
-            if instance.memory_mb > self.memory_threshold:
-                last_alert = self.alert_history[pid]['memory']
-                if current_time - last_alert > self.alert_cooldown:
-                    alerts.append({
-                        'type': 'memory',
-                        'pid': pid,
-                        'process': instance.working_dir.split('/')[-1],
-                        'value': instance.memory_mb,
-                        'threshold': self.memory_threshold
-                    })
-                    self.alert_history[pid]['memory'] = current_time
-        
-        # Clean up alert history for dead processes
-        active_pids = {inst.pid for inst in self.instances}
-        self.alert_history = {pid: hist for pid, hist in self.alert_history.items() if pid in active_pids}
+            if memory_hot and current_time - self.memory_alert_times.get(pid, 0) > self.alert_cooldown:
+                alerts.append({
+                    'type': 'memory',
+                    'pid': pid,
+                    'process': instance.working_dir.rpartition('/')[2],
+                    'value': instance.memory_mb,
+                    'threshold': memory_threshold
+                })
+                self.memory_alert_times[pid] = current_time
+        
+        # Clean up alert times for dead processes
+        if self.cpu_alert_times or self.memory_alert_times:
+            active_pids = {inst.pid for inst in self.instances}
+            for alert_times in (self.cpu_alert_times, self.memory_alert_times):
+                for pid in alert_times.keys() - active_pids:
+                    del alert_times[pid]
         
         return alerts
\ No newline at end of file
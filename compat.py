@@ -0,0 +1,9 @@
+#!/usr/bin/env python3
+"""Python version compatibility helpers for Claude Top"""
+
+import sys
+from dataclasses import dataclass
+
+# Dataclass decorator for records built in bulk on every refresh: slots=True
+# drops the per-instance __dict__, but dataclass only accepts it on 3.10+
+dataclass_slots = dataclass(slots=True) if sys.version_info >= (3, 10) else dataclass
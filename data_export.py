@@ -5,17 +5,80 @@ import csv
 import json
 import sqlite3
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional
+from typing import Dict, Iterable, List, Optional
 from pathlib import Path
 
+from database_schema import SQLITE_PRAGMAS, ensure_schema
+
+try:
+    import orjson
+except ImportError:  # optional speedup; the json module gives the same layout
+    orjson = None
+
+# Export files are written through a 1 MiB buffer, so large exports make a
+# few large write() calls rather than one per 8 KiB
+EXPORT_BUFFER_SIZE = 1 << 20
+
+def dumps_indented(obj) -> bytes:
+    """Serialize obj as UTF-8 JSON indented by two spaces"""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    return json.dumps(obj, indent=2, ensure_ascii=False).encode('utf-8')
+
+# The lists of the JSON export. Sessions and daily summaries read their
+# metrics from session_metric_summary rather than aggregating every sample.
+EXPORT_PROJECTS_SQL = '''
+    SELECT id, name, path, created_at, last_seen
+    FROM projects
+    ORDER BY name
+'''
+
+EXPORT_SESSIONS_SQL = '''
+    SELECT ps.id, ps.pid, ps.project_id, ps.start_time, ps.end_time,
+           ps.elapsed_seconds, ps.command, ps.status,
+           sms.sample_count, sms.cpu_sum / sms.cpu_count,
+           sms.memory_sum / sms.memory_count, sms.net_max, sms.disk_max
+    FROM process_sessions ps
+    LEFT JOIN session_metric_summary sms ON sms.session_id = ps.id
+    WHERE ps.start_time >= ? AND ps.start_time <= ?
+    ORDER BY ps.start_time DESC
+'''
+
+EXPORT_DAILY_SQL = '''
+    SELECT DATE(ps.start_time) as date, COUNT(*),
+           SUM(COALESCE(ps.elapsed_seconds, 0)),
+           SUM(sms.cpu_sum) / SUM(sms.cpu_count),
+           SUM(sms.memory_sum) / SUM(sms.memory_count),
+           COUNT(DISTINCT ps.project_id)
+    FROM process_sessions ps
+    LEFT JOIN session_metric_summary sms ON sms.session_id = ps.id
+    WHERE ps.start_time >= ? AND ps.start_time <= ?
+    GROUP BY DATE(ps.start_time)
+    ORDER BY date DESC
+'''
+
 class DataExporter:
     def __init__(self, db_path: str = "claude_tracking.db"):
         self.db_path = db_path
+    
+    def connect(self) -> sqlite3.Connection:
+        """Open a connection with the same tuning PRAGMAs as ClaudeDatabase
+        
+        The first call creates or migrates the schema, since the exports read
+        session_metric_summary. The journal mode is left alone: WAL is
+        persistent in the database file and ClaudeDatabase switches it on
+        when it creates the schema.
+        """
+        ensure_schema(self.db_path)
+        conn = sqlite3.connect(self.db_path)
+        for pragma in SQLITE_PRAGMAS:
+            conn.execute(pragma)
+        return conn
         
     def export_sessions_csv(self, output_file: str, days: int = 30) -> bool:
         """Export session data to CSV format"""
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = self.connect()
             cursor = conn.cursor()
             
             # Calculate date range
@@ -31,27 +94,23 @@ class DataExporter:
                     p.path as project_path,
                     ps.start_time,
                     ps.end_time,
-                    ps.duration_seconds,
+                    ps.elapsed_seconds,
                     ps.command,
                     ps.status,
-                    AVG(pm.cpu_percent) as avg_cpu,
-                    AVG(pm.memory_mb) as avg_memory,
-                    MAX(pm.net_bytes_total) as total_network,
-                    MAX(pm.disk_total_bytes) as total_disk,
-                    COUNT(pm.id) as metric_samples
+                    sms.cpu_sum / sms.cpu_count as avg_cpu,
+                    sms.memory_sum / sms.memory_count as avg_memory,
+                    sms.net_max as total_network,
+                    sms.disk_max as total_disk,
+                    COALESCE(sms.sample_count, 0) as metric_samples
                 FROM process_sessions ps
                 JOIN projects p ON ps.project_id = p.id
-                LEFT JOIN process_metrics pm ON ps.id = pm.session_id
+                LEFT JOIN session_metric_summary sms ON sms.session_id = ps.id
                 WHERE ps.start_time >= ? AND ps.start_time <= ?
-                GROUP BY ps.id
                 ORDER BY ps.start_time DESC
             ''', (start_date.isoformat(), end_date.isoformat()))
             
-            results = cursor.fetchall()
-            conn.close()
-            
-            # Write CSV file
-            with open(output_file, 'w', newline='', encoding='utf-8') as csvfile:
+            # Write CSV file, streaming rows straight from the cursor
+            with open(output_file, 'w', newline='', encoding='utf-8', buffering=EXPORT_BUFFER_SIZE) as csvfile:
                 writer = csv.writer(csvfile)
                 
                 # Write header
@@ -64,9 +123,9 @@ class DataExporter:
                 writer.writerow(header)
                 
                 # Write data
-                for row in results:
-                    writer.writerow(row)
+                writer.writerows(cursor)
             
+            conn.close()
             return True
             
         except Exception as e:
@@ -76,7 +135,7 @@ class DataExporter:
     def export_metrics_csv(self, output_file: str, days: int = 7) -> bool:
         """Export detailed metrics data to CSV format"""
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = self.connect()
             cursor = conn.cursor()
             
             # Calculate date range
@@ -108,11 +167,8 @@ class DataExporter:
                 ORDER BY pm.timestamp DESC
             ''', (start_date.isoformat(), end_date.isoformat()))
             
-            results = cursor.fetchall()
-            conn.close()
-            
-            # Write CSV file
-            with open(output_file, 'w', newline='', encoding='utf-8') as csvfile:
+            # Write CSV file, streaming rows straight from the cursor
+            with open(output_file, 'w', newline='', encoding='utf-8', buffering=EXPORT_BUFFER_SIZE) as csvfile:
                 writer = csv.writer(csvfile)
                 
                 # Write header
@@ -125,9 +181,9 @@ class DataExporter:
                 writer.writerow(header)
                 
                 # Write data
-                for row in results:
-                    writer.writerow(row)
+                writer.writerows(cursor)
             
+            conn.close()
             return True
             
         except Exception as e:
@@ -137,7 +193,7 @@ class DataExporter:
     def export_project_summary_csv(self, output_file: str) -> bool:
         """Export project summary statistics to CSV"""
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = self.connect()
             cursor = conn.cursor()
             
             # Get project statistics
@@ -145,28 +201,25 @@ class DataExporter:
                 SELECT 
                     p.name,
                     p.path,
-                    COUNT(DISTINCT ps.id) as total_sessions,
-                    AVG(pm.cpu_percent) as avg_cpu,
-                    AVG(pm.memory_mb) as avg_memory,
-                    SUM(COALESCE(ps.duration_seconds, 0)) as total_runtime,
-                    MAX(pm.net_bytes_total) as max_network,
-                    MAX(pm.disk_total_bytes) as max_disk,
+                    COUNT(ps.id) as total_sessions,
+                    SUM(sms.cpu_sum) / SUM(sms.cpu_count) as avg_cpu,
+                    SUM(sms.memory_sum) / SUM(sms.memory_count) as avg_memory,
+                    SUM(COALESCE(ps.elapsed_seconds, 0)) as total_runtime,
+                    MAX(sms.net_max) as max_network,
+                    MAX(sms.disk_max) as max_disk,
                     MIN(ps.start_time) as first_session,
                     MAX(COALESCE(ps.end_time, ps.start_time)) as last_session,
-                    COUNT(pm.id) as total_metrics
+                    COALESCE(SUM(sms.sample_count), 0) as total_metrics
                 FROM projects p
                 LEFT JOIN process_sessions ps ON p.id = ps.project_id
-                LEFT JOIN process_metrics pm ON ps.id = pm.session_id
+                LEFT JOIN session_metric_summary sms ON sms.session_id = ps.id
                 GROUP BY p.id, p.name, p.path
                 HAVING total_sessions > 0
                 ORDER BY total_sessions DESC
             ''')
             
-            results = cursor.fetchall()
-            conn.close()
-            
-            # Write CSV file
-            with open(output_file, 'w', newline='', encoding='utf-8') as csvfile:
+            # Write CSV file, streaming rows straight from the cursor
+            with open(output_file, 'w', newline='', encoding='utf-8', buffering=EXPORT_BUFFER_SIZE) as csvfile:
                 writer = csv.writer(csvfile)
                 
                 # Write header
@@ -178,75 +231,68 @@ class DataExporter:
                 writer.writerow(header)
                 
                 # Write data
-                for row in results:
-                    writer.writerow(row)
+                writer.writerows(cursor)
             
+            conn.close()
             return True
             
         except Exception as e:
             print(f"Error exporting project summary CSV: {e}")
             return False
     
+    @staticmethod
+    def write_json_list(jsonfile, name: str, items: Iterable[Dict], last: bool = False):
+        """Write one top-level list of the JSON export an element at a time
+        
+        The layout matches json.dump(..., indent=2) of the whole document, so
+        streamed exports read the same as ones built in memory.
+        """
+        jsonfile.write(f'  {json.dumps(name)}: ['.encode('utf-8'))
+        empty = True
+        for item in items:
+            jsonfile.write(b'\n    ' if empty else b',\n    ')
+            jsonfile.write(dumps_indented(item).replace(b'\n', b'\n    '))
+            empty = False
+        jsonfile.write(b']' if empty else b'\n  ]')
+        jsonfile.write(b'\n' if last else b',\n')
+    
     def export_data_json(self, output_file: str, days: int = 30) -> bool:
-        """Export comprehensive data to JSON format"""
+        """Export comprehensive data to JSON format
+        
+        Rows are written as the cursor produces them rather than collected
+        into one document first, so memory stays flat however long the window.
+        """
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = self.connect()
             cursor = conn.cursor()
             
             # Calculate date range
             end_date = datetime.now()
             start_date = end_date - timedelta(days=days)
             
-            export_data = {
-                'export_info': {
-                    'generated_at': datetime.now().isoformat(),
-                    'timeframe_start': start_date.isoformat(),
-                    'timeframe_end': end_date.isoformat(),
-                    'days_included': days
-                },
-                'projects': [],
-                'sessions': [],
-                'daily_summaries': []
+            export_info = {
+                'generated_at': datetime.now().isoformat(),
+                'timeframe_start': start_date.isoformat(),
+                'timeframe_end': end_date.isoformat(),
+                'days_included': days
             }
             
-            # Get projects
-            cursor.execute('''
-                SELECT id, name, path, created_at, last_seen
-                FROM projects
-                ORDER BY name
-            ''')
-            projects = cursor.fetchall()
-            
-            for project in projects:
-                export_data['projects'].append({
+            with open(output_file, 'wb', buffering=EXPORT_BUFFER_SIZE) as jsonfile:
+                jsonfile.write(b'{\n  "export_info": ')
+                jsonfile.write(dumps_indented(export_info).replace(b'\n', b'\n  '))
+                jsonfile.write(b',\n')
+                
+                window = (start_date.isoformat(), end_date.isoformat())
+                
+                self.write_json_list(jsonfile, 'projects', ({
                     'id': project[0],
                     'name': project[1],
                     'path': project[2],
                     'created_at': project[3],
                     'last_seen': project[4]
-                })
-            
-            # Get sessions with metrics summary
-            cursor.execute('''
-                SELECT 
-                    ps.id, ps.pid, ps.project_id, ps.start_time, ps.end_time,
-                    ps.duration_seconds, ps.command, ps.status,
-                    COUNT(pm.id) as metric_count,
-                    AVG(pm.cpu_percent) as avg_cpu,
-                    AVG(pm.memory_mb) as avg_memory,
-                    MAX(pm.net_bytes_total) as total_network,
-                    MAX(pm.disk_total_bytes) as total_disk
-                FROM process_sessions ps
-                LEFT JOIN process_metrics pm ON ps.id = pm.session_id
-                WHERE ps.start_time >= ? AND ps.start_time <= ?
-                GROUP BY ps.id
-                ORDER BY ps.start_time DESC
-            ''', (start_date.isoformat(), end_date.isoformat()))
-            
-            sessions = cursor.fetchall()
-            
-            for session in sessions:
-                export_data['sessions'].append({
+                } for project in cursor.execute(EXPORT_PROJECTS_SQL)))
+                
+                self.write_json_list(jsonfile, 'sessions', ({
                     'id': session[0],
                     'pid': session[1],
                     'project_id': session[2],
@@ -262,42 +308,20 @@ class DataExporter:
                         'total_network_bytes': session[11] or 0,
                         'total_disk_bytes': session[12] or 0
                     }
-                })
-            
-            # Get daily summaries
-            cursor.execute('''
-                SELECT 
-                    DATE(ps.start_time) as date,
-                    COUNT(DISTINCT ps.id) as sessions,
-                    SUM(COALESCE(ps.duration_seconds, 0)) as total_runtime,
-                    AVG(pm.cpu_percent) as avg_cpu,
-                    AVG(pm.memory_mb) as avg_memory,
-                    COUNT(DISTINCT ps.project_id) as unique_projects
-                FROM process_sessions ps
-                LEFT JOIN process_metrics pm ON ps.id = pm.session_id
-                WHERE ps.start_time >= ? AND ps.start_time <= ?
-                GROUP BY DATE(ps.start_time)
-                ORDER BY date DESC
-            ''', (start_date.isoformat(), end_date.isoformat()))
-            
-            daily_data = cursor.fetchall()
-            
-            for day in daily_data:
-                export_data['daily_summaries'].append({
+                } for session in cursor.execute(EXPORT_SESSIONS_SQL, window)))
+                
+                self.write_json_list(jsonfile, 'daily_summaries', ({
                     'date': day[0],
                     'sessions': day[1],
                     'total_runtime_seconds': day[2] or 0,
                     'avg_cpu_percent': day[3] or 0,
                     'avg_memory_mb': day[4] or 0,
                     'unique_projects': day[5] or 0
-                })
+                } for day in cursor.execute(EXPORT_DAILY_SQL, window)), last=True)
+                
+                jsonfile.write(b'}')
             
             conn.close()
-            
-            # Write JSON file
-            with open(output_file, 'w', encoding='utf-8') as jsonfile:
-                json.dump(export_data, jsonfile, indent=2, ensure_ascii=False)
-            
             return True
             
         except Exception as e:
@@ -307,7 +331,7 @@ class DataExporter:
     def get_export_stats(self) -> Dict:
         """Get statistics about available data for export"""
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = self.connect()
             cursor = conn.cursor()
             
             # Get basic stats
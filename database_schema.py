@@ -3,10 +3,16 @@
 
 import sqlite3
 import os
+import threading
+import weakref
+from contextlib import contextmanager
 from datetime import datetime
-from typing import Optional, Dict, List
+from pathlib import Path
+from typing import Optional, Dict, List, Iterable, Iterator
 from dataclasses import dataclass
 
+from compat import dataclass_slots
+
 @dataclass
 class ProjectStats:
     project_name: str
@@ -17,7 +23,7 @@ class ProjectStats:
     total_network: int  # bytes
     total_disk: int     # bytes
 
-@dataclass
+@dataclass_slots
 class ProcessTreeNode:
     pid: int
     parent_pid: int
@@ -26,14 +32,143 @@ class ProcessTreeNode:
     memory_mb: float
     children: List['ProcessTreeNode']
 
+# Connection tuning applied on every open: WAL lets the monitor write while
+# analytics reads, and synchronous=NORMAL is safe under WAL
+SQLITE_JOURNAL_PRAGMA = 'PRAGMA journal_mode=WAL'
+SQLITE_PRAGMAS = (
+    'PRAGMA synchronous=NORMAL',
+    'PRAGMA busy_timeout=5000',
+    'PRAGMA cache_size=-20000',
+    'PRAGMA temp_store=MEMORY',
+    'PRAGMA mmap_size=268435456',
+)
+
+METRICS_INSERT_SQL = '''
+    INSERT INTO process_metrics (
+        session_id, cpu_percent, memory_mb, net_bytes_sent, net_bytes_recv,
+        net_bytes_total, disk_total_bytes, disk_current_bytes,
+        connections_count, mcp_connections, status
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+'''
+
+TREE_INSERT_SQL = '''
+    INSERT INTO process_tree (
+        session_id, pid, parent_pid, command, depth, cpu_percent, memory_mb
+    ) VALUES (?, ?, ?, ?, ?, ?, ?)
+'''
+
+# Recomputes session_metric_summary rows from process_metrics; callers append
+# a WHERE clause, if any, and GROUP BY session_id
+SESSION_SUMMARY_REBUILD_SQL = '''
+    INSERT OR REPLACE INTO session_metric_summary (
+        session_id, sample_count, cpu_sum, cpu_count,
+        memory_sum, memory_count, net_max, disk_max
+    )
+    SELECT session_id, COUNT(*), SUM(cpu_percent), COUNT(cpu_percent),
+           SUM(memory_mb), COUNT(memory_mb), MAX(net_bytes_total), MAX(disk_total_bytes)
+    FROM process_metrics
+'''
+
+# Rows removed per transaction by cleanup_old_data; each batch releases the
+# write lock so the monitor's per-cycle inserts are never held up for long
+CLEANUP_BATCH_SIZE = 10000
+
+def instance_metrics_rows(instances: Iterable, session_ids: Dict[int, int]) -> Iterator[tuple]:
+    """Yield METRICS_INSERT_SQL parameters straight from ClaudeInstance objects
+    
+    session_ids maps each instance's pid to its open session.
+    """
+    for inst in instances:
+        yield (
+            session_ids[inst.pid],
+            inst.cpu_percent,
+            inst.memory_mb,
+            inst.net_bytes_sent,
+            inst.net_bytes_recv,
+            inst.net_bytes_total,
+            inst.disk_total_bytes,
+            inst.disk_current_bytes,
+            inst.connections_count,
+            inst.mcp_connections,
+            inst.status
+        )
+
+def close_connections(connections: List[sqlite3.Connection], lock: threading.Lock):
+    """Close and forget every connection in the list"""
+    with lock:
+        closing = connections[:]
+        connections.clear()
+    for conn in closing:
+        conn.close()
+
 class ClaudeDatabase:
     def __init__(self, db_path: str = "claude_tracking.db"):
         self.db_path = db_path
+        # One lazily opened connection per thread, reused by every call so
+        # writes skip the open and PRAGMA round trips and sqlite3's
+        # per-connection statement cache stays warm. They are closed by
+        # close(), when the object is collected, or at interpreter exit.
+        self._local = threading.local()
+        self._connections: List[sqlite3.Connection] = []
+        self._connections_lock = threading.Lock()
+        weakref.finalize(self, close_connections, self._connections, self._connections_lock)
         self.init_database()
     
+    def connect(self, check_same_thread: bool = True, read_only: bool = False) -> sqlite3.Connection:
+        """Open a connection to the database with performance PRAGMAs applied
+        
+        Read-only connections cannot change the journal mode; they rely on a
+        writer connection having switched the file to WAL, which is what lets
+        them read while the monitor writes.
+        """
+        if read_only:
+            uri = Path(self.db_path).resolve().as_uri() + '?mode=ro'
+            conn = sqlite3.connect(uri, uri=True, check_same_thread=check_same_thread)
+        else:
+            conn = sqlite3.connect(self.db_path, check_same_thread=check_same_thread)
+            conn.execute(SQLITE_JOURNAL_PRAGMA)
+        
+        for pragma in SQLITE_PRAGMAS:
+            conn.execute(pragma)
+        return conn
+    
+    def connection(self) -> sqlite3.Connection:
+        """Return this thread's shared connection, opening it on first use"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            # Not bound to this thread so close() can run from any thread
+            conn = self.connect(check_same_thread=False)
+            self._local.conn = conn
+            with self._connections_lock:
+                self._connections.append(conn)
+        return conn
+    
+    def close(self):
+        """Close the shared connections; the next call opens fresh ones"""
+        close_connections(self._connections, self._connections_lock)
+        self._local = threading.local()
+    
+    @contextmanager
+    def transaction(self):
+        """Hold a single write transaction for a burst of writes
+        
+        BEGIN IMMEDIATE takes the write lock up front so the burst never has
+        to upgrade a read lock mid-way; the connection context manager commits
+        once at the end, or rolls back on error.
+        """
+        conn = self.connection()
+        conn.execute('BEGIN IMMEDIATE')
+        with conn:
+            yield conn
+    
     def init_database(self):
-        """Initialize the SQLite database with required tables"""
-        conn = sqlite3.connect(self.db_path)
+        """Initialize the SQLite database with required tables
+        
+        Opening through connect() switches the file to WAL here, and the
+        journal mode persists, so every later connection also writes through
+        the WAL, including ones opened with plain sqlite3.connect().
+        """
+        conn = self.connection()
         cursor = conn.cursor()
         
         # Projects table - tracks working directories/projects
@@ -55,7 +190,7 @@ class ClaudeDatabase:
                 project_id INTEGER,
                 start_time TIMESTAMP NOT NULL,
                 end_time TIMESTAMP,
-                duration_seconds INTEGER,
+                duration_seconds INTEGER,  -- no longer written; see elapsed_seconds
                 command TEXT,
                 status TEXT,
                 created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
@@ -99,40 +234,123 @@ class ClaudeDatabase:
             )
         ''')
         
-        # Project statistics view
+        # Session length derived from start/end time so readers never see a stale or missing value
+        columns = {row[1] for row in cursor.execute('PRAGMA table_xinfo(process_sessions)')}
+        if 'elapsed_seconds' not in columns:
+            # One-time data migration: end_time used to be written as
+            # CURRENT_TIMESTAMP (UTC, whole seconds) while start_time is local
+            # time. Converting those stamps to local time moves them onto the
+            # start_time clock without changing the instant they record.
+            cursor.execute('''
+                UPDATE process_sessions
+                SET end_time = datetime(end_time, 'localtime')
+                WHERE end_time IS NOT NULL
+            ''')
+            cursor.execute('''
+                ALTER TABLE process_sessions ADD COLUMN elapsed_seconds INTEGER
+                GENERATED ALWAYS AS (CAST((julianday(end_time) - julianday(start_time)) * 86400 AS INTEGER)) VIRTUAL
+            ''')
+        
+        # Per-session metric aggregates, kept current by a trigger on every sample
+        # so exports read one row per session instead of re-aggregating metrics
+        summary_exists = cursor.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'session_metric_summary'"
+        ).fetchone()
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS session_metric_summary (
+                session_id INTEGER PRIMARY KEY,
+                sample_count INTEGER NOT NULL DEFAULT 0,
+                cpu_sum REAL,
+                cpu_count INTEGER NOT NULL DEFAULT 0,
+                memory_sum REAL,
+                memory_count INTEGER NOT NULL DEFAULT 0,
+                net_max INTEGER,
+                disk_max INTEGER
+            )
+        ''')
+        if not summary_exists:
+            cursor.execute(SESSION_SUMMARY_REBUILD_SQL + ' GROUP BY session_id')
+        # NULL samples are skipped, matching SUM()/COUNT()/MAX() over the rows
+        cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS trg_pm_session_summary
+            AFTER INSERT ON process_metrics
+            BEGIN
+                INSERT INTO session_metric_summary (
+                    session_id, sample_count, cpu_sum, cpu_count,
+                    memory_sum, memory_count, net_max, disk_max
+                ) VALUES (
+                    NEW.session_id, 1, NEW.cpu_percent, NEW.cpu_percent IS NOT NULL,
+                    NEW.memory_mb, NEW.memory_mb IS NOT NULL, NEW.net_bytes_total, NEW.disk_total_bytes
+                )
+                ON CONFLICT(session_id) DO UPDATE SET
+                    sample_count = sample_count + 1,
+                    cpu_sum = COALESCE(cpu_sum + excluded.cpu_sum, cpu_sum, excluded.cpu_sum),
+                    cpu_count = cpu_count + excluded.cpu_count,
+                    memory_sum = COALESCE(memory_sum + excluded.memory_sum, memory_sum, excluded.memory_sum),
+                    memory_count = memory_count + excluded.memory_count,
+                    net_max = COALESCE(max(net_max, excluded.net_max), net_max, excluded.net_max),
+                    disk_max = COALESCE(max(disk_max, excluded.disk_max), disk_max, excluded.disk_max);
+            END
+        ''')
+        
+        # Project statistics view, rolled up from the per-session summaries so it
+        # reads one row per session; views from before the summary table or
+        # elapsed_seconds are replaced
+        view_sql = cursor.execute(
+            "SELECT sql FROM sqlite_master WHERE type = 'view' AND name = 'project_stats'"
+        ).fetchone()
+        if view_sql and 'elapsed_seconds' not in view_sql[0]:
+            cursor.execute('DROP VIEW project_stats')
         cursor.execute('''
             CREATE VIEW IF NOT EXISTS project_stats AS
             SELECT 
                 p.id,
                 p.name,
                 p.path,
-                COUNT(DISTINCT ps.id) as total_sessions,
-                AVG(pm.cpu_percent) as avg_cpu,
-                AVG(pm.memory_mb) as avg_memory,
-                SUM(COALESCE(ps.duration_seconds, 0)) as total_runtime,
-                MAX(pm.net_bytes_total) as max_network,
-                MAX(pm.disk_total_bytes) as max_disk,
+                COUNT(ps.id) as total_sessions,
+                SUM(sms.cpu_sum) / SUM(sms.cpu_count) as avg_cpu,
+                SUM(sms.memory_sum) / SUM(sms.memory_count) as avg_memory,
+                SUM(COALESCE(ps.elapsed_seconds, 0)) as total_runtime,
+                MAX(sms.net_max) as max_network,
+                MAX(sms.disk_max) as max_disk,
                 MIN(ps.start_time) as first_seen,
                 MAX(COALESCE(ps.end_time, ps.start_time)) as last_seen
             FROM projects p
             LEFT JOIN process_sessions ps ON p.id = ps.project_id
-            LEFT JOIN process_metrics pm ON ps.id = pm.session_id
+            LEFT JOIN session_metric_summary sms ON sms.session_id = ps.id
             GROUP BY p.id, p.name, p.path
         ''')
         
         # Create indexes for performance
         cursor.execute('CREATE INDEX IF NOT EXISTS idx_process_sessions_pid ON process_sessions(pid)')
-        cursor.execute('CREATE INDEX IF NOT EXISTS idx_process_metrics_session_id ON process_metrics(session_id)')
         cursor.execute('CREATE INDEX IF NOT EXISTS idx_process_metrics_timestamp ON process_metrics(timestamp)')
+        # Covering indexes so the analytics aggregates are served from the index alone
+        cursor.execute('DROP INDEX IF EXISTS idx_process_metrics_session_id')  # prefix of idx_pm_session_cover
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_pm_session_cover ON process_metrics(
+                session_id, timestamp, cpu_percent, memory_mb, net_bytes_total, disk_total_bytes
+            )
+        ''')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_ps_start ON process_sessions(start_time, project_id, id)')
+        cursor.execute('DROP INDEX IF EXISTS idx_ps_elapsed')  # no query sorts by session length
+        cursor.execute('DROP INDEX IF EXISTS idx_pt_session_cmd')  # no query filters on it
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_pt_ts_cmd ON process_tree(timestamp, command)')
+        cursor.execute('DROP INDEX IF EXISTS idx_pt_session_ts')  # its tree-refresh DELETE never matches a row
         cursor.execute('CREATE INDEX IF NOT EXISTS idx_process_tree_session_id ON process_tree(session_id)')
+        # Project rollups (project_stats, the project summary export) join sessions by project
+        cursor.execute('DROP INDEX IF EXISTS idx_ps_project_cover')  # covered duration_seconds
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_ps_project_elapsed ON process_sessions(
+                project_id, start_time, end_time, elapsed_seconds
+            )
+        ''')
         cursor.execute('CREATE INDEX IF NOT EXISTS idx_process_tree_pid ON process_tree(pid)')
         
         conn.commit()
-        conn.close()
     
     def get_or_create_project(self, working_dir: str) -> int:
         """Get existing project or create new one based on working directory"""
-        conn = sqlite3.connect(self.db_path)
+        conn = self.connection()
         cursor = conn.cursor()
         
         # Extract project name from path
@@ -167,12 +385,11 @@ class ClaudeDatabase:
             project_id = cursor.lastrowid
         
         conn.commit()
-        conn.close()
         return project_id
     
     def start_session(self, pid: int, project_id: int, command: str) -> int:
         """Start a new process session"""
-        conn = sqlite3.connect(self.db_path)
+        conn = self.connection()
         cursor = conn.cursor()
         
         cursor.execute('''
@@ -182,43 +399,26 @@ class ClaudeDatabase:
         
         session_id = cursor.lastrowid
         conn.commit()
-        conn.close()
         return session_id
     
     def end_session(self, session_id: int):
         """End a process session"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        # Get start time to calculate duration
-        cursor.execute('SELECT start_time FROM process_sessions WHERE id = ?', (session_id,))
-        result = cursor.fetchone()
+        conn = self.connection()
         
-        if result:
-            start_time = datetime.fromisoformat(result[0])
-            duration = int((datetime.now() - start_time).total_seconds())
-            
-            cursor.execute('''
-                UPDATE process_sessions 
-                SET end_time = CURRENT_TIMESTAMP, duration_seconds = ?, status = ?
-                WHERE id = ?
-            ''', (duration, 'ended', session_id))
+        # Same local clock as start_time, which elapsed_seconds is derived from
+        end_time = datetime.now().isoformat(' ')
+        conn.execute('''
+            UPDATE process_sessions 
+            SET end_time = ?, status = ?
+            WHERE id = ?
+        ''', (end_time, 'ended', session_id))
         
         conn.commit()
-        conn.close()
     
-    def record_metrics(self, session_id: int, metrics: Dict):
-        """Record process metrics"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            INSERT INTO process_metrics (
-                session_id, cpu_percent, memory_mb, net_bytes_sent, net_bytes_recv,
-                net_bytes_total, disk_total_bytes, disk_current_bytes,
-                connections_count, mcp_connections, status
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        ''', (
+    @staticmethod
+    def metrics_params(session_id: int, metrics: Dict) -> tuple:
+        """Build the METRICS_INSERT_SQL parameters for one metrics sample"""
+        return (
             session_id,
             metrics.get('cpu_percent', 0),
             metrics.get('memory_mb', 0),
@@ -230,14 +430,38 @@ class ClaudeDatabase:
             metrics.get('connections_count', 0),
             metrics.get('mcp_connections', 0),
             metrics.get('status', 'unknown')
-        ))
+        )
+    
+    def record_metrics(self, session_id: int, metrics: Dict):
+        """Record process metrics"""
+        self.record_metrics_many([self.metrics_params(session_id, metrics)])
+    
+    def record_metrics_many(self, rows: Iterable[tuple], conn: Optional[sqlite3.Connection] = None):
+        """Record many metrics samples in one executemany
         
-        conn.commit()
-        conn.close()
+        rows may be any iterable of metrics_params()/instance_metrics_rows()
+        tuples, including a generator, which is consumed as it is bound.
+        
+        When conn is given the rows join the caller's transaction, otherwise
+        they are committed in a transaction of their own.
+        """
+        if conn is None:
+            with self.transaction() as conn:
+                return self.record_metrics_many(rows, conn)
+        
+        conn.executemany(METRICS_INSERT_SQL, rows)
     
-    def record_process_tree(self, session_id: int, tree_nodes: List[ProcessTreeNode]):
-        """Record process tree structure"""
-        conn = sqlite3.connect(self.db_path)
+    def record_process_tree(self, session_id: int, tree_nodes: List[ProcessTreeNode],
+                            conn: Optional[sqlite3.Connection] = None):
+        """Record process tree structure
+        
+        When conn is given the rows join the caller's transaction, otherwise
+        they are committed in a transaction of their own.
+        """
+        if conn is None:
+            with self.transaction() as conn:
+                return self.record_process_tree(session_id, tree_nodes, conn)
+        
         cursor = conn.cursor()
         
         # Clear existing tree data for this session and timestamp
@@ -246,30 +470,24 @@ class ClaudeDatabase:
             WHERE session_id = ? AND timestamp = date('now')
         ''', (session_id,))
         
-        def insert_node(node: ProcessTreeNode, depth: int = 0):
-            cursor.execute('''
-                INSERT INTO process_tree (
-                    session_id, pid, parent_pid, command, depth, cpu_percent, memory_mb
-                ) VALUES (?, ?, ?, ?, ?, ?, ?)
-            ''', (
+        # Gather every node's row first so the whole tree goes in one executemany.
+        # Iterative pre-order walk: children are pushed in reverse so they
+        # come out in their original order
+        rows = []
+        stack = [(node, 0) for node in reversed(tree_nodes)]
+        while stack:
+            node, depth = stack.pop()
+            rows.append((
                 session_id, node.pid, node.parent_pid, node.command,
                 depth, node.cpu_percent, node.memory_mb
             ))
-            
-            # Recursively insert children
-            for child in node.children:
-                insert_node(child, depth + 1)
+            stack.extend((child, depth + 1) for child in reversed(node.children))
         
-        for node in tree_nodes:
-            insert_node(node)
-        
-        conn.commit()
-        conn.close()
+        cursor.executemany(TREE_INSERT_SQL, rows)
     
     def get_project_stats(self, project_name: Optional[str] = None) -> List[ProjectStats]:
         """Get project statistics"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        cursor = self.connection().cursor()
         
         if project_name:
             cursor.execute('SELECT * FROM project_stats WHERE name = ?', (project_name,))
@@ -277,7 +495,6 @@ class ClaudeDatabase:
             cursor.execute('SELECT * FROM project_stats ORDER BY total_sessions DESC')
         
         results = cursor.fetchall()
-        conn.close()
         
         stats = []
         for row in results:
@@ -295,8 +512,7 @@ class ClaudeDatabase:
     
     def get_active_sessions(self) -> List[Dict]:
         """Get currently active sessions"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        cursor = self.connection().cursor()
         
         cursor.execute('''
             SELECT ps.id, ps.pid, p.name, ps.start_time, ps.command
@@ -307,7 +523,6 @@ class ClaudeDatabase:
         ''')
         
         results = cursor.fetchall()
-        conn.close()
         
         sessions = []
         for row in results:
@@ -321,25 +536,62 @@ class ClaudeDatabase:
         
         return sessions
     
+    def delete_older_than(self, table: str, cutoff: str):
+        """Delete the rows of table stamped before cutoff, a batch at a time"""
+        conn = self.connection()
+        sql = f'''
+            DELETE FROM {table} WHERE id IN (
+                SELECT id FROM {table} WHERE timestamp < ? LIMIT ?
+            )
+        '''
+        while True:
+            with conn:
+                deleted = conn.execute(sql, (cutoff, CLEANUP_BATCH_SIZE)).rowcount
+            if deleted < CLEANUP_BATCH_SIZE:
+                break
+    
     def cleanup_old_data(self, days: int = 30):
         """Clean up old data beyond specified days"""
-        conn = sqlite3.connect(self.db_path)
+        conn = self.connection()
         cursor = conn.cursor()
+        # Fixed once so every batch deletes against the same cutoff; the
+        # modifier is bound rather than formatted in
+        cutoff = cursor.execute("SELECT datetime('now', ?)", (f'-{int(days)} days',)).fetchone()[0]
+        
+        # Sessions losing samples need their summary rows recomputed afterwards
+        affected_sessions = cursor.execute('''
+            SELECT DISTINCT session_id FROM process_metrics
+            WHERE timestamp < ?
+        ''', (cutoff,)).fetchall()
         
         # Clean old metrics data
-        cursor.execute('''
-            DELETE FROM process_metrics 
-            WHERE timestamp < datetime('now', '-{} days')
-        '''.format(days))
+        self.delete_older_than('process_metrics', cutoff)
+        
+        # Drop the summaries of those sessions, then rebuild any with samples left
+        with conn:
+            cursor.executemany('DELETE FROM session_metric_summary WHERE session_id = ?', affected_sessions)
+            cursor.executemany(SESSION_SUMMARY_REBUILD_SQL + ' WHERE session_id = ? GROUP BY session_id',
+                               affected_sessions)
         
         # Clean old tree data
-        cursor.execute('''
-            DELETE FROM process_tree 
-            WHERE timestamp < datetime('now', '-{} days')
-        '''.format(days))
+        self.delete_older_than('process_tree', cutoff)
         
-        conn.commit()
-        conn.close()
+        # Fold the WAL the deletes went through back in and shrink it
+        cursor.execute('PRAGMA wal_checkpoint(TRUNCATE)')
+
+# Absolute paths whose schema this process has already created or migrated
+_schema_ready = set()
+
+def ensure_schema(db_path: str):
+    """Create or migrate the schema at db_path, once per process
+    
+    For readers that open plain connections of their own rather than going
+    through ClaudeDatabase.
+    """
+    path = os.path.abspath(db_path)
+    if path not in _schema_ready:
+        ClaudeDatabase(db_path).close()
+        _schema_ready.add(path)
 
 def test_database():
     """Test the database functionality"""
@@ -9,6 +9,8 @@ from dataclasses import dataclass
 from collections import defaultdict
 import math
 
+from database_schema import ensure_schema
+
 @dataclass
 class AnalyticsData:
     """Data structure for analytics calculations"""
@@ -29,10 +31,15 @@ class HistoricalAnalytics:
         self.db_path = db_path
         self.current_view = "overview"  # overview, daily, weekly, monthly, projects
         self.selected_timeframe = 7  # days
+    
+    def connect(self) -> sqlite3.Connection:
+        """Open a connection, creating or migrating the schema on first use"""
+        ensure_schema(self.db_path)
+        return sqlite3.connect(self.db_path)
         
     def get_analytics_data(self, days: int = 7) -> AnalyticsData:
         """Get comprehensive analytics data for the specified timeframe"""
-        conn = sqlite3.connect(self.db_path)
+        conn = self.connect()
         cursor = conn.cursor()
         
         # Calculate date range
@@ -43,7 +50,7 @@ class HistoricalAnalytics:
         cursor.execute('''
             SELECT 
                 COUNT(*) as total_sessions,
-                SUM(COALESCE(duration_seconds, 0)) as total_runtime,
+                SUM(COALESCE(elapsed_seconds, 0)) as total_runtime,
                 COUNT(DISTINCT project_id) as unique_projects
             FROM process_sessions 
             WHERE start_time >= ? AND start_time <= ?
@@ -127,7 +134,7 @@ class HistoricalAnalytics:
     
     def get_daily_trends(self, days: int = 30) -> List[Tuple[str, int, int]]:
         """Get daily session and runtime trends"""
-        conn = sqlite3.connect(self.db_path)
+        conn = self.connect()
         cursor = conn.cursor()
         
         end_date = datetime.now()
@@ -137,7 +144,7 @@ class HistoricalAnalytics:
             SELECT 
                 DATE(start_time) as date,
                 COUNT(*) as sessions,
-                SUM(COALESCE(duration_seconds, 0)) as runtime
+                SUM(COALESCE(elapsed_seconds, 0)) as runtime
             FROM process_sessions 
             WHERE start_time >= ? AND start_time <= ?
             GROUP BY DATE(start_time)
@@ -152,7 +159,7 @@ class HistoricalAnalytics:
     
     def get_project_analytics(self) -> List[Dict]:
         """Get detailed project analytics"""
-        conn = sqlite3.connect(self.db_path)
+        conn = self.connect()
         cursor = conn.cursor()
         
         cursor.execute('''
@@ -162,7 +169,7 @@ class HistoricalAnalytics:
                 COUNT(DISTINCT ps.id) as total_sessions,
                 AVG(pm.cpu_percent) as avg_cpu,
                 AVG(pm.memory_mb) as avg_memory,
-                SUM(COALESCE(ps.duration_seconds, 0)) as total_runtime,
+                SUM(COALESCE(ps.elapsed_seconds, 0)) as total_runtime,
                 MAX(pm.net_bytes_total) as max_network,
                 MAX(pm.disk_total_bytes) as max_disk,
                 MIN(ps.start_time) as first_session,
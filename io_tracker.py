@@ -9,6 +9,14 @@ from collections import defaultdict
 from dataclasses import dataclass
 from typing import Dict, Optional
 
+# Seconds between open_files()/net_connections() reads for the same process;
+# both walk the process's descriptors and rarely change between samples
+CONNECTION_REFRESH_INTERVAL = 5.0
+
+# Cached counts not refreshed for this long belong to processes nobody asks
+# about any more, usually ones that have exited, and are dropped
+CONNECTION_CACHE_MAX_AGE = 60.0
+
 @dataclass
 class IOStats:
     read_bytes: int = 0
@@ -27,6 +35,7 @@ class MacOSIOTracker:
     def __init__(self):
         self.previous_stats = {}
         self.network_stats = {}
+        self.connection_cache = {}  # pid -> (read_at, open_files, network_connections)
         
     def get_process_io_with_iotop(self, pid: int) -> Optional[IOStats]:
         """Get I/O stats using iotop command (if available)"""
@@ -110,32 +119,52 @@ class MacOSIOTracker:
         try:
             proc = psutil.Process(pid)
             
-            # Get thread count
-            indicators['threads'] = proc.num_threads()
-            
-            # Get memory usage
-            memory_info = proc.memory_info()
-            indicators['memory_usage'] = memory_info.rss
-            
-            # Get open files count
-            try:
-                open_files = proc.open_files()
-                indicators['open_files'] = len(open_files)
-            except psutil.AccessDenied:
-                pass
-            
-            # Get network connections
-            try:
-                connections = proc.net_connections()
-                indicators['network_connections'] = len(connections)
-            except psutil.AccessDenied:
-                pass
+            # Thread count and memory come from the same /proc parse under oneshot()
+            with proc.oneshot():
+                # Get thread count
+                indicators['threads'] = proc.num_threads()
+                
+                # Get memory usage
+                memory_info = proc.memory_info()
+                indicators['memory_usage'] = memory_info.rss
+                
+            # Open file and connection counts, re-read at most every
+            # CONNECTION_REFRESH_INTERVAL seconds
+            now = time.monotonic()
+            cached = self.connection_cache.get(pid)
+            if cached and now - cached[0] < CONNECTION_REFRESH_INTERVAL:
+                indicators['open_files'], indicators['network_connections'] = cached[1:]
+            else:
+                # Get open files count
+                try:
+                    open_files = proc.open_files()
+                    indicators['open_files'] = len(open_files)
+                except psutil.AccessDenied:
+                    pass
+                
+                # Get network connections
+                try:
+                    connections = proc.net_connections(kind='inet')
+                    indicators['network_connections'] = len(connections)
+                except psutil.AccessDenied:
+                    pass
+                
+                self.connection_cache[pid] = (now, indicators['open_files'],
+                                              indicators['network_connections'])
+                self.prune_connection_cache(now)
                 
         except psutil.NoSuchProcess:
-            pass
+            self.connection_cache.pop(pid, None)
         
         return indicators
     
+    def prune_connection_cache(self, now: float):
+        """Drop cached counts that have not been refreshed for CONNECTION_CACHE_MAX_AGE"""
+        stale = [pid for pid, cached in self.connection_cache.items()
+                 if now - cached[0] > CONNECTION_CACHE_MAX_AGE]
+        for pid in stale:
+            del self.connection_cache[pid]
+    
     def estimate_io_from_activity(self, pid: int) -> (IOStats, NetworkStats):
         """Estimate I/O based on process activity indicators"""
         
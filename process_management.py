@@ -61,7 +61,7 @@ class ProcessManager:
                 open_files = 0
             
             try:
-                connections = len(proc.net_connections())
+                connections = len(proc.net_connections(kind='inet'))
             except psutil.AccessDenied:
                 connections = 0
             
@@ -102,10 +102,12 @@ class ProcessManager:
         except Exception as e:
             return False, f"Error changing priority: {str(e)}"
     
-    def find_zombie_processes(self) -> List[int]:
-        """Find all zombie processes"""
+    def find_zombie_processes(self, processes=None) -> List[int]:
+        """Find all zombie processes, optionally in an existing process_iter pass"""
         zombies = []
-        for proc in psutil.process_iter(['pid', 'status']):
+        if processes is None:
+            processes = psutil.process_iter(['pid', 'status'])
+        for proc in processes:
             try:
                 if proc.info['status'] == 'zombie':
                     zombies.append(proc.info['pid'])
@@ -113,25 +115,30 @@ class ProcessManager:
                 continue
         return zombies
     
-    def find_orphaned_claude_processes(self) -> List[int]:
+    def find_orphaned_claude_processes(self, processes=None) -> List[int]:
         """Find orphaned Claude processes (parent is init)"""
         orphans = []
-        for proc in psutil.process_iter(['pid', 'ppid', 'name', 'cmdline']):
+        # Only pid/cmdline are fetched for every process; ppid is read for matches only
+        # unless the given process_iter pass already carries it
+        if processes is None:
+            processes = psutil.process_iter(['pid', 'cmdline'])
+        for proc in processes:
             try:
                 # Check if this is a Claude process
                 cmdline = proc.info.get('cmdline', [])
-                if cmdline and any('claude' in cmd.lower() for cmd in cmdline):
+                if cmdline and any('claude' in arg.lower() for arg in cmdline):
                     # Check if orphaned (parent is init/1)
-                    if proc.info['ppid'] == 1 and proc.info['pid'] != 1:
+                    ppid = proc.info['ppid'] if 'ppid' in proc.info else proc.ppid()
+                    if proc.info['pid'] != 1 and ppid == 1:
                         orphans.append(proc.info['pid'])
             except (psutil.NoSuchProcess, psutil.AccessDenied):
                 continue
         return orphans
     
-    def cleanup_zombie_processes(self) -> List[Tuple[int, bool, str]]:
+    def cleanup_zombie_processes(self, processes=None) -> List[Tuple[int, bool, str]]:
         """Attempt to clean up zombie processes"""
         results = []
-        zombies = self.find_zombie_processes()
+        zombies = self.find_zombie_processes(processes)
         
         for pid in zombies:
             try:
@@ -214,15 +221,18 @@ class ProcessManager:
         
         self.last_cleanup = now
         
+        # The zombie and orphan checks share a single process_iter pass
+        processes = list(psutil.process_iter(['pid', 'ppid', 'status', 'cmdline']))
+        
         # Clean up zombies if enabled
         if self.auto_cleanup_zombies:
-            zombie_results = self.cleanup_zombie_processes()
+            zombie_results = self.cleanup_zombie_processes(processes)
             results['zombies_cleaned'] = zombie_results
             if zombie_results:
                 results['actions_taken'].append(f"Cleaned {len(zombie_results)} zombies")
         
         # Find orphans (but don't auto-clean unless specifically enabled)
-        orphans = self.find_orphaned_claude_processes()
+        orphans = self.find_orphaned_claude_processes(processes)
         results['orphans_found'] = orphans
         
         if self.auto_cleanup_orphans and orphans:
@@ -3,10 +3,27 @@
 
 import psutil
 from typing import Dict, List, Optional, Set
-from dataclasses import dataclass, field
-from collections import defaultdict
+from dataclasses import field
+from collections import defaultdict, Counter
 
-@dataclass
+from compat import dataclass_slots
+
+# Command substrings that mark a subprocess as a system tool
+_SYSTEM_TOOL_TERMS = ('git', 'ssh', 'curl', 'wget')
+
+def _categorize(name_lower: str, command_lower: str) -> str:
+    """Bucket a subprocess by its lower-cased name and command line"""
+    if 'python' in name_lower:
+        return 'Python'
+    if 'node' in name_lower or 'npm' in command_lower:
+        return 'Node.js'
+    if any(term in command_lower for term in _SYSTEM_TOOL_TERMS):
+        return 'System Tools'
+    if 'docker' in command_lower:
+        return 'Docker'
+    return 'Other'
+
+@dataclass_slots
 class ProcessNode:
     pid: int
     parent_pid: Optional[int]
@@ -108,6 +125,23 @@ class ProcessTreeTracker:
         except (psutil.NoSuchProcess, psutil.AccessDenied):
             pass
     
+    def extend_tree(self, tree: ProcessNode, from_depth: int, max_depth: int):
+        """Deepen a tree discovered with max_depth=from_depth to max_depth
+        
+        Only the nodes on the old depth limit are expanded, so the levels
+        already discovered are not scanned again.
+        """
+        if from_depth >= max_depth:
+            return
+        
+        stack = [tree]
+        while stack:
+            node = stack.pop()
+            if node.depth == from_depth:
+                self._build_tree(node, max_depth)
+            else:
+                stack.extend(node.children)
+    
     def find_related_processes(self, claude_pids: List[int]) -> Dict[int, ProcessNode]:
         """Find all processes related to Claude instances"""
         trees = {}
@@ -125,7 +159,7 @@ class ProcessTreeTracker:
             'total_processes': 0,
             'total_cpu': 0.0,
             'total_memory': 0.0,
-            'subprocess_types': defaultdict(int),
+            'subprocess_types': Counter(),
             'active_subprocesses': [],
             'max_depth': 0
         }
@@ -137,16 +171,7 @@ class ProcessTreeTracker:
             analysis['max_depth'] = max(analysis['max_depth'], node.depth)
             
             # Categorize subprocess types
-            if 'python' in node.name.lower():
-                analysis['subprocess_types']['Python'] += 1
-            elif 'node' in node.name.lower() or 'npm' in node.command.lower():
-                analysis['subprocess_types']['Node.js'] += 1
-            elif any(term in node.command.lower() for term in ['git', 'ssh', 'curl', 'wget']):
-                analysis['subprocess_types']['System Tools'] += 1
-            elif 'docker' in node.command.lower():
-                analysis['subprocess_types']['Docker'] += 1
-            else:
-                analysis['subprocess_types']['Other'] += 1
+            analysis['subprocess_types'][_categorize(node.name.lower(), node.command.lower())] += 1
             
             # Track active subprocesses (high CPU or memory)
             if node.cpu_percent > 1.0 or node.memory_mb > 10.0:
@@ -7,8 +7,12 @@ from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Tuple
 from dataclasses import dataclass
 from collections import defaultdict
+from heapq import nlargest
+from operator import itemgetter
 import math
 
+from database_schema import ensure_schema
+
 @dataclass
 class ProductivityMetrics:
     """Productivity metrics for a time period"""
@@ -43,9 +47,14 @@ class ProductivityAnalyzer:
     def __init__(self, db_path: str = "claude_tracking.db"):
         self.db_path = db_path
     
+    def connect(self) -> sqlite3.Connection:
+        """Open a connection, creating or migrating the schema on first use"""
+        ensure_schema(self.db_path)
+        return sqlite3.connect(self.db_path)
+    
     def calculate_productivity_metrics(self, days: int = 7) -> ProductivityMetrics:
         """Calculate comprehensive productivity metrics"""
-        conn = sqlite3.connect(self.db_path)
+        conn = self.connect()
         cursor = conn.cursor()
         
         # Calculate date range
@@ -56,7 +65,7 @@ class ProductivityAnalyzer:
         cursor.execute('''
             SELECT 
                 ps.id,
-                ps.duration_seconds,
+                ps.elapsed_seconds,
                 pm.status,
                 COUNT(*) as status_count,
                 pm.cpu_percent,
@@ -132,11 +141,11 @@ class ProductivityAnalyzer:
         productivity_score = (active_time / total_time * 100) if total_time > 0 else 0
         
         # Find peak hours (top 3)
-        peak_hours = sorted(hourly_activity.items(), key=lambda x: x[1], reverse=True)[:3]
+        peak_hours = nlargest(3, hourly_activity.items(), key=itemgetter(1))
         peak_hours = [hour for hour, _ in peak_hours]
         
         # Most productive day
-        most_productive_day = max(daily_activity.items(), key=lambda x: x[1])[0] if daily_activity else "N/A"
+        most_productive_day = max(daily_activity, key=daily_activity.get) if daily_activity else "N/A"
         
         # Efficiency rating
         if productivity_score >= 80:
@@ -183,7 +192,7 @@ class ProductivityAnalyzer:
     
     def analyze_session_patterns(self, days: int = 7) -> List[SessionPattern]:
         """Analyze individual session patterns"""
-        conn = sqlite3.connect(self.db_path)
+        conn = self.connect()
         cursor = conn.cursor()
         
         # Calculate date range
@@ -195,7 +204,7 @@ class ProductivityAnalyzer:
             SELECT 
                 ps.id,
                 p.name,
-                ps.duration_seconds,
+                ps.elapsed_seconds,
                 COUNT(CASE WHEN pm.status = 'running' THEN 1 END) as active_count,
                 COUNT(pm.id) as total_count,
                 AVG(pm.cpu_percent) as avg_cpu,
@@ -206,7 +215,7 @@ class ProductivityAnalyzer:
             JOIN projects p ON ps.project_id = p.id
             LEFT JOIN process_metrics pm ON ps.id = pm.session_id
             WHERE ps.start_time >= ? AND ps.start_time <= ?
-                AND ps.duration_seconds > 60  -- Only analyze sessions > 1 minute
+                AND ps.elapsed_seconds > 60  -- Only analyze sessions > 1 minute
             GROUP BY ps.id
             HAVING total_count > 5  -- Only sessions with enough data points
             ORDER BY ps.start_time DESC
@@ -259,7 +268,7 @@ class ProductivityAnalyzer:
     
     def get_productivity_trends(self, days: int = 30) -> List[Tuple[str, float, int]]:
         """Get daily productivity trends"""
-        conn = sqlite3.connect(self.db_path)
+        conn = self.connect()
         cursor = conn.cursor()
         
         # Calculate date range
@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""Test analytics queries against a small seeded database"""
+
+import sys
+import os
+import json
+import sqlite3
+import tempfile
+import time
+sys.path.insert(0, os.path.dirname(__file__))
+
+from database_schema import ClaudeDatabase, ProcessTreeNode
+from analytics import ClaudeAnalytics, invalidate_report_cache
+
+def create_test_database(db_path):
+    """Seed a database with two projects and a few subprocesses"""
+    db = ClaudeDatabase(db_path)
+
+    subprocesses = {
+        '/Users/test/projects/web-app': ['node server.js', 'npm run build', 'git status', 'python manage.py'],
+        '/Users/test/projects/api-service': ['python -m pytest', 'python app.py', 'docker ps', 'make'],
+    }
+
+    for pid, (working_dir, commands) in enumerate(subprocesses.items(), start=1001):
+        project_id = db.get_or_create_project(working_dir)
+        session_id = db.start_session(pid, project_id, 'claude')
+        db.record_metrics(session_id, {'cpu_percent': 10.0, 'memory_mb': 200.0, 'status': 'running'})
+        db.record_metrics(session_id, {'cpu_percent': 0.0, 'memory_mb': 220.0, 'status': 'idle'})
+        db.record_process_tree(session_id, [
+            ProcessTreeNode(pid=pid * 10 + i, parent_pid=pid, command=cmd,
+                            cpu_percent=float(i), memory_mb=60.0 * i, children=[])
+            for i, cmd in enumerate(commands)
+        ])
+
+    return db
+
+def test_usage_report():
+    """Test per-project usage report and subprocess categories"""
+    print("Testing Usage Report")
+    print("=" * 50)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, 'analytics.db')
+        create_test_database(db_path)
+        analytics = ClaudeAnalytics(db_path)
+
+        reports = {r.project_name: r for r in analytics.generate_usage_report(7)}
+        for name, report in reports.items():
+            print(f"  {name}: {report.session_count} sessions, {report.subprocess_types}")
+
+        assert set(reports) == {'web-app', 'api-service'}
+        assert reports['web-app'].subprocess_types == {'Node.js': 2, 'System Tools': 1, 'Python': 1}
+        assert reports['api-service'].subprocess_types == {'Python': 2, 'Docker': 1, 'Other': 1}
+        assert reports['web-app'].peak_memory_mb == 220.0
+        print("✅ PASS")
+
+def test_subprocess_analysis():
+    """Test subprocess frequency, categories and resource-heavy detection"""
+    print("\nTesting Subprocess Analysis")
+    print("=" * 50)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, 'analytics.db')
+        create_test_database(db_path)
+        analytics = ClaudeAnalytics(db_path)
+
+        analysis = analytics.get_subprocess_analysis()
+        print(f"  Categories: {analysis['categories']}")
+
+        assert analysis['total_subprocesses'] == 8
+        assert analysis['unique_commands'] == 8
+        assert analysis['categories'] == {
+            'Python': 3, 'Node.js': 2, 'System Tools': 1, 'Docker': 1, 'Other': 1
+        }
+        heavy = {entry['command'] for entry in analysis['resource_heavy']}
+        assert heavy == {'npm run build', 'git status', 'python manage.py',
+                         'python app.py', 'docker ps', 'make'}
+
+        project_analysis = analytics.get_subprocess_analysis('web-app')
+        assert project_analysis['categories']['Node.js'] == 2
+        assert project_analysis['categories']['Docker'] == 0
+        print("✅ PASS")
+
+def test_session_details():
+    """Test session summaries including status breakdown"""
+    print("\nTesting Session Details")
+    print("=" * 50)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, 'analytics.db')
+        create_test_database(db_path)
+        analytics = ClaudeAnalytics(db_path)
+
+        sessions = analytics.get_session_details(limit=10)
+        for session in sessions:
+            print(f"  Session {session.session_id}: {', '.join(session.status_changes)}")
+
+        assert len(sessions) == 2
+        assert all(sorted(s.status_changes) == ['idle(1)', 'running(1)'] for s in sessions)
+
+        single = analytics.get_session_details(session_id=sessions[0].session_id)
+        assert len(single) == 1 and single[0].max_memory == 220.0
+        print("✅ PASS")
+
+def test_resource_trends():
+    """Test that resource trends are grouped into 5-minute buckets"""
+    print("\nTesting Resource Trends")
+    print("=" * 50)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, 'analytics.db')
+        create_test_database(db_path)
+
+        # Three samples two hours ago: two share a bucket, one falls in the next
+        bucket_start = int(time.time() - 7200) // 300 * 300
+        conn = sqlite3.connect(db_path)
+        conn.execute('DELETE FROM process_metrics')
+        for offset, cpu in ((10, 10.0), (100, 20.0), (400, 40.0)):
+            timestamp = time.strftime('%Y-%m-%d %H:%M:%S', time.gmtime(bucket_start + offset))
+            conn.execute(
+                'INSERT INTO process_metrics (session_id, timestamp, cpu_percent, memory_mb) VALUES (1, ?, ?, 100)',
+                (timestamp, cpu)
+            )
+        conn.commit()
+        conn.close()
+
+        trends = ClaudeAnalytics(db_path).get_resource_trends('web-app', hours=24)
+        print(f"  Buckets: {trends['timestamps']}")
+        print(f"  CPU: {trends['cpu_percent']}")
+
+        assert trends['timestamps'] == [
+            time.strftime('%Y-%m-%d %H:%M:%S', time.gmtime(bucket_start)),
+            time.strftime('%Y-%m-%d %H:%M:%S', time.gmtime(bucket_start + 300)),
+        ]
+        assert trends['cpu_percent'] == [15.0, 40.0]
+        assert trends['process_count'] == [1, 1]
+        print("✅ PASS")
+
+def test_report_cache():
+    """Test that cached reports are reused until invalidated"""
+    print("\nTesting Report Cache")
+    print("=" * 50)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, 'analytics.db')
+        db = create_test_database(db_path)
+        analytics = ClaudeAnalytics(db_path)
+
+        first = analytics.generate_usage_report(7)
+        project_id = db.get_or_create_project('/Users/test/projects/cli-tool')
+        db.start_session(1003, project_id, 'claude')
+
+        cached = analytics.generate_usage_report(7)
+        print(f"  Before invalidation: {len(cached)} projects")
+        assert cached is first
+
+        invalidate_report_cache(db_path)
+        refreshed = analytics.generate_usage_report(7)
+        print(f"  After invalidation: {len(refreshed)} projects")
+        assert len(refreshed) == 3
+        print("✅ PASS")
+
+def test_export_report():
+    """Test that the streamed JSON report is a complete document"""
+    print("\nTesting Report Export")
+    print("=" * 50)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, 'analytics.db')
+        create_test_database(db_path)
+        analytics = ClaudeAnalytics(db_path)
+
+        report_file = analytics.export_report(os.path.join(tmp, 'report.json'))
+        with open(report_file) as f:
+            report = json.load(f)
+
+        print(f"  Sections: {list(report)}")
+        assert list(report) == ['generated_at', 'usage_report_7d', 'recent_sessions', 'subprocess_analysis']
+        assert {r['project_name'] for r in report['usage_report_7d']} == {'web-app', 'api-service'}
+        assert len(report['recent_sessions']) == 2
+        assert report['subprocess_analysis']['total_subprocesses'] == 8
+        print("✅ PASS")
+
+if __name__ == "__main__":
+    test_usage_report()
+    test_subprocess_analysis()
+    test_session_details()
+    test_resource_trends()
+    test_report_cache()
+    test_export_report()
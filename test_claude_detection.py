@@ -8,7 +8,8 @@ def find_claude_processes():
     """Find all Claude CLI processes running on the system"""
     claude_processes = []
     
-    for proc in psutil.process_iter(['pid', 'name', 'cmdline', 'cwd', 'create_time', 'cpu_percent', 'memory_info']):
+    # Only pid/name/cmdline are fetched for every process; the rest is read for matches only
+    for proc in psutil.process_iter(['pid', 'name', 'cmdline']):
         try:
             # Check if this is a Claude CLI process
             cmdline = proc.info.get('cmdline', [])
@@ -21,6 +22,8 @@ def find_claude_processes():
                 if 'docker' in cmdline_str and 'mcp/filesystem' in cmdline_str:
                     continue
                     
+                proc.info.update(proc.as_dict(['cwd', 'cpu_percent', 'memory_info']))
+                
                 # Try to get working directory
                 cwd = proc.info.get('cwd', None)
                 if not cwd or cwd == '/':
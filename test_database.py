@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""Test the database write paths that maintain derived data"""
+
+import sys
+import os
+import sqlite3
+import tempfile
+sys.path.insert(0, os.path.dirname(__file__))
+
+from database_schema import ClaudeDatabase, CLEANUP_BATCH_SIZE
+
+SUMMARY_COLUMNS = '''
+    session_id, sample_count, cpu_sum, cpu_count,
+    memory_sum, memory_count, net_max, disk_max
+'''
+
+EXPECTED_SUMMARY_SQL = '''
+    SELECT session_id, COUNT(*), SUM(cpu_percent), COUNT(cpu_percent),
+           SUM(memory_mb), COUNT(memory_mb), MAX(net_bytes_total), MAX(disk_total_bytes)
+    FROM process_metrics
+    GROUP BY session_id
+    ORDER BY session_id
+'''
+
+def summaries(db_path):
+    """Return the maintained summaries and the ones GROUP BY computes from the samples"""
+    conn = sqlite3.connect(db_path)
+    try:
+        maintained = conn.execute(
+            f'SELECT {SUMMARY_COLUMNS} FROM session_metric_summary ORDER BY session_id'
+        ).fetchall()
+        expected = conn.execute(EXPECTED_SUMMARY_SQL).fetchall()
+    finally:
+        conn.close()
+    return maintained, expected
+
+def record_samples(db, session_id, samples):
+    """Record (cpu_percent, memory_mb, net_bytes_total) samples, None kept as NULL"""
+    db.record_metrics_many([
+        ClaudeDatabase.metrics_params(session_id, {
+            'cpu_percent': cpu, 'memory_mb': memory,
+            'net_bytes_total': net, 'disk_total_bytes': net,
+        })
+        for cpu, memory, net in samples
+    ])
+
+def create_sessions(db):
+    """Start three sessions: mixed samples, all-NULL CPU, and no samples"""
+    project_id = db.get_or_create_project('/Users/test/projects/web-app')
+    busy = db.start_session(2001, project_id, 'claude')
+    quiet = db.start_session(2002, project_id, 'claude')
+    db.start_session(2003, project_id, 'claude')
+
+    record_samples(db, busy, [(10.0, 200.0, 100), (None, 250.0, 300), (2.5, None, None)])
+    record_samples(db, busy, [(7.5, 50.0, 200)])
+    record_samples(db, quiet, [(None, 100.0, None), (None, None, 50)])
+    return busy, quiet
+
+def test_summary_trigger():
+    """Test that inserts keep session_metric_summary equal to GROUP BY over the samples"""
+    print("Testing Session Summary Trigger")
+    print("=" * 50)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, 'tracking.db')
+        db = ClaudeDatabase(db_path)
+        busy, quiet = create_sessions(db)
+        db.close()
+
+        maintained, expected = summaries(db_path)
+        for row in maintained:
+            print(f"  {row}")
+
+        assert maintained == expected
+        assert maintained[0] == (busy, 4, 20.0, 3, 500.0, 3, 300, 300)
+        # A session whose CPU samples are all NULL has no CPU sum, like SUM()
+        assert maintained[1] == (quiet, 2, None, 0, 100.0, 1, 50, 50)
+        print("✅ PASS")
+
+def test_summary_backfill():
+    """Test that a database from before the summary table gets it backfilled"""
+    print("\nTesting Session Summary Backfill")
+    print("=" * 50)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, 'tracking.db')
+        db = ClaudeDatabase(db_path)
+        db.close()
+
+        # Strip the summary machinery, then record samples the old way
+        conn = sqlite3.connect(db_path)
+        conn.execute('DROP TRIGGER trg_pm_session_summary')
+        conn.execute('DROP TABLE session_metric_summary')
+        conn.executemany(
+            'INSERT INTO process_metrics (session_id, cpu_percent, memory_mb, net_bytes_total) VALUES (?, ?, ?, ?)',
+            [(1, 10.0, 200.0, 100), (1, None, 300.0, 400), (2, 4.0, None, None)]
+        )
+        conn.commit()
+        conn.close()
+
+        ClaudeDatabase(db_path).close()
+        maintained, expected = summaries(db_path)
+        for row in maintained:
+            print(f"  {row}")
+
+        assert len(maintained) == 2
+        assert maintained == expected
+        print("✅ PASS")
+
+def test_cleanup_batches():
+    """Test that cleanup deletes more than one batch and rebuilds the affected summaries"""
+    print("\nTesting Batched Cleanup")
+    print("=" * 50)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, 'tracking.db')
+        db = ClaudeDatabase(db_path)
+        busy, quiet = create_sessions(db)
+
+        # Old samples for both sessions, enough to need several delete batches
+        old_count = CLEANUP_BATCH_SIZE + CLEANUP_BATCH_SIZE // 2
+        conn = sqlite3.connect(db_path)
+        conn.executemany(
+            "INSERT INTO process_metrics (session_id, cpu_percent, memory_mb, timestamp) "
+            "VALUES (?, ?, ?, datetime('now', '-40 days'))",
+            ((busy if i % 3 else quiet, float(i % 50), 100.0) for i in range(old_count))
+        )
+        conn.executemany(
+            "INSERT INTO process_tree (session_id, pid, parent_pid, command, depth, timestamp) "
+            "VALUES (?, ?, 2001, 'node', 1, datetime('now', '-40 days'))",
+            ((busy, 3000 + i) for i in range(CLEANUP_BATCH_SIZE + 1))
+        )
+        # A session with old samples only loses its summary altogether
+        conn.execute(
+            "INSERT INTO process_metrics (session_id, cpu_percent, timestamp) "
+            "VALUES (99, 1.0, datetime('now', '-40 days'))"
+        )
+        conn.commit()
+        conn.close()
+
+        db.cleanup_old_data(30)
+        db.close()
+
+        conn = sqlite3.connect(db_path)
+        metrics_left = conn.execute('SELECT COUNT(*) FROM process_metrics').fetchone()[0]
+        tree_left = conn.execute('SELECT COUNT(*) FROM process_tree').fetchone()[0]
+        conn.close()
+        maintained, expected = summaries(db_path)
+        print(f"  Metrics left: {metrics_left}, tree rows left: {tree_left}")
+        for row in maintained:
+            print(f"  {row}")
+
+        assert metrics_left == 6
+        assert tree_left == 0
+        assert maintained == expected
+        assert [row[0] for row in maintained] == [busy, quiet]
+        print("✅ PASS")
+
+if __name__ == "__main__":
+    test_summary_trigger()
+    test_summary_backfill()
+    test_cleanup_batches()